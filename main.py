@@ -1,5 +1,4 @@
-def main():
-    print("Hello from cyrill!")
+from src.preprocessing.cli import main
 
 
 if __name__ == "__main__":
@@ -1,3 +1,16 @@
-from .loaders import HFImageLoader
+import importlib
+from typing import Any
 
 __all__ = ['HFImageLoader']
+
+# HFImageLoader тянет за собой datasets/pyarrow, поэтому импортируется
+# лениво (PEP 562) — воркерам, которым нужны только аугментации, он не нужен.
+_LAZY = {'HFImageLoader': '.loaders'}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
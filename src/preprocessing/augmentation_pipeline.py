@@ -9,6 +9,10 @@ from PIL import Image
 from .configs import PipelineConfig
 
 
+def _pipeline_from_dict(spec: Dict[str, Any]) -> "AugmentationPipeline":
+    return AugmentationPipeline.from_dict(spec)
+
+
 class AugmentationPipeline:
     """
     Пайплайн аугментаций.
@@ -35,6 +39,24 @@ class AugmentationPipeline:
             raise ValueError("Sum of aug_weights must be > 0")
         self._p = [p / total for p in self._p]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Описание пайплайна: конфигурация и seed.
+        """
+        return {"config": self.config.to_dict(), "seed": self.seed}
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "AugmentationPipeline":
+        return cls(PipelineConfig.from_dict(spec["config"]), seed=spec.get("seed"))
+
+    def __reduce__(self):
+        # В воркеры передаём компактное описание вместо живых объектов
+        # аугментаций; если аугментация не зарегистрирована — обычный pickle
+        try:
+            return _pipeline_from_dict, (self.to_dict(),)
+        except KeyError:
+            return AugmentationPipeline, (self.config, self.seed)
+
     def _rng(self, idx: Optional[int]) -> random.Random:
         # Если задан seed — требуем idx, чтобы выбор был стабильным на датасете HF
         if self.seed is None:
@@ -45,6 +67,31 @@ class AugmentationPipeline:
 
         return random.Random(int(self.seed) + int(idx))
 
+    def choose(self, idx: Optional[int] = None, force: bool = False) -> Optional[str]:
+        """
+        Выбрать аугментацию для примера, не применяя её.
+
+        Args:
+            idx - индекс примера (обязателен, если задан seed)
+            force - выбрать аугментацию всегда, без учёта p_aug
+        Returns:
+            str - имя аугментации или None, если пример не аугментируется
+        """
+        rng = self._rng(idx)
+
+        # Решаем, применяем ли аугментацию вообще
+        if not force and rng.random() > float(self.config.p_aug):
+            return None
+
+        # Выбираем одну аугментацию по вероятностям
+        return rng.choices(self._names, weights=self._p, k=1)[0]
+
+    def get(self, name: str) -> Any:
+        """
+        Аугментация пайплайна по имени.
+        """
+        return self._augs[name]
+
     def __call__(
         self,
         image: Image.Image | np.ndarray,
@@ -59,20 +106,20 @@ class AugmentationPipeline:
             image - Аугментированное изображение
             meta - Метаданные (что применили и с какими параметрами)
         """
-        rng = self._rng(idx)
-
-        # Решаем, применяем ли аугментацию вообще
-        if rng.random() > float(self.config.p_aug):
+        name = self.choose(idx)
+        if name is None:
             return image, {"applied": False}
 
-        # Выбираем одну аугментацию по вероятностям
-        name = rng.choices(self._names, weights=self._p, k=1)[0]
         aug = self._augs[name]
 
-        img_out, params = aug(image)
+        if self.config.tile_size:
+            img_out, params = aug(image, tile_size=self.config.tile_size,
+                                  max_workers=self.config.tile_workers)
+        else:
+            img_out, params = aug(image)
 
         meta: Dict[str, Any] = {"applied": True, "name": name}
         if self.config.return_params:
-            meta["params"] = params
+            meta["params"] = aug.scalar_params(params) if self.config.compact_params else params
 
         return img_out, meta
@@ -0,0 +1,5 @@
+from .builder import build_dataset, build_source, is_up_to_date
+from .sources import DEFAULT_RULES, SourceSpec
+
+__all__ = ['build_dataset', 'build_source', 'is_up_to_date',
+           'DEFAULT_RULES', 'SourceSpec']
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from ..segmentation import InkCropper
+from ..utils.hashing import config_hash
+from ..writers import ParquetShardWriter
+from .sources import SourceSpec
+
+NORMALIZE_MODES = ("none", "gray", "crop")
+SUCCESS_FILE = "_SUCCESS.json"
+
+# Версия формата сборки: при изменении все источники пересобираются
+BUILD_VERSION = 1
+
+_cropper: Optional[InkCropper] = None
+
+
+def encode_sample(task: Tuple[str, str]) -> bytes:
+    """
+    Прочитать и нормализовать одно изображение (выполняется в воркере).
+
+    Args:
+        task - (путь к файлу, режим нормализации)
+    Returns:
+        bytes - закодированное изображение (исходные байты для "none", PNG иначе)
+    """
+    global _cropper
+
+    path, normalize = task
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if normalize == "none":
+        return data
+
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        raise ValueError(f"Failed to decode image: {path}")
+
+    if normalize == "crop":
+        if _cropper is None:
+            _cropper = InkCropper()
+        image = _cropper(image)[0]
+
+    ok, buf = cv2.imencode(".png", image)
+    if not ok:
+        raise ValueError(f"Failed to encode image: {path}")
+    return buf.tobytes()
+
+
+def _chunks(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _build_fingerprint(
+    spec: SourceSpec,
+    normalize: str,
+    rows_per_shard: int,
+    max_shard_bytes: Optional[int] = None,
+) -> str:
+    params = {
+        "version": BUILD_VERSION,
+        "source": spec.fingerprint(),
+        "normalize": normalize,
+        "rows_per_shard": rows_per_shard,
+    }
+    # Только если задан — чтобы прежние сборки оставались актуальными
+    if max_shard_bytes is not None:
+        params["max_shard_bytes"] = max_shard_bytes
+    return config_hash(params)
+
+
+def is_up_to_date(
+    spec: SourceSpec,
+    out_dir: str,
+    normalize: str = "none",
+    rows_per_shard: int = 1000,
+    max_shard_bytes: Optional[int] = None,
+) -> bool:
+    """
+    Собран ли источник с теми же входными данными и параметрами.
+    """
+    marker = os.path.join(out_dir, spec.name, SUCCESS_FILE)
+    if not os.path.exists(marker):
+        return False
+    with open(marker, encoding="utf-8") as f:
+        info = json.load(f)
+    return info.get("fingerprint") == _build_fingerprint(spec, normalize, rows_per_shard, max_shard_bytes)
+
+
+def build_source(
+    spec: SourceSpec,
+    out_dir: str,
+    normalize: str = "none",
+    rows_per_shard: int = 1000,
+    chunk_rows: int = 1024,
+    executor: Optional[Executor] = None,
+    max_shard_bytes: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Собрать шарды одного источника.
+
+    Манифест читается потоково, изображения обрабатываются чанками
+    (параллельно, если передан executor), строки сразу уходят
+    в ParquetShardWriter по сплитам. Результат собирается во временной
+    директории и подменяет старые шарды источника только после успеха.
+
+    Args:
+        spec - описание источника
+        out_dir - корневая директория датасета
+        normalize - none / gray / crop (обрезка по чернилам, см. InkCropper)
+        rows_per_shard - строк в одном Parquet-шарде
+        chunk_rows - строк, обрабатываемых за один проход пула
+        executor - пул для декодирования/нормализации (опционально)
+        max_shard_bytes - максимальный объём шарда в байтах (опционально)
+    Returns:
+        dict - число примеров по сплитам
+    """
+    if normalize not in NORMALIZE_MODES:
+        raise ValueError(f"normalize must be one of {NORMALIZE_MODES}")
+
+    final_dir = os.path.join(out_dir, spec.name)
+    tmp_dir = os.path.join(out_dir, f".{spec.name}.building")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    writers: Dict[str, ParquetShardWriter] = {}
+    counts: Dict[str, int] = {}
+
+    for chunk in _chunks(spec.iter_rows(), chunk_rows):
+        tasks = [(row["path"], normalize) for row in chunk]
+        if executor is None:
+            images = map(encode_sample, tasks)
+        else:
+            images = executor.map(encode_sample, tasks, chunksize=16)
+
+        for row, data in zip(chunk, images):
+            split = row["split"]
+            if split not in writers:
+                writers[split] = ParquetShardWriter(tmp_dir, prefix=split, rows_per_shard=rows_per_shard,
+                                                    max_shard_bytes=max_shard_bytes)
+            writers[split].write({
+                "image": {"bytes": data, "path": row["rel_path"]},
+                "text": row["text"],
+                "dataset": spec.name,
+                "split": split,
+                "source_split": row["source_split"],
+            })
+            counts[split] = counts.get(split, 0) + 1
+
+    for writer in writers.values():
+        writer.close()
+
+    os.makedirs(tmp_dir, exist_ok=True)
+    with open(os.path.join(tmp_dir, SUCCESS_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "fingerprint": _build_fingerprint(spec, normalize, rows_per_shard, max_shard_bytes),
+            "counts": counts,
+        }, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(tmp_dir, final_dir)
+    return counts
+
+
+def build_dataset(
+    specs: Sequence[SourceSpec],
+    out_dir: str,
+    normalize: str = "none",
+    rows_per_shard: int = 1000,
+    num_workers: Optional[int] = None,
+    force: bool = False,
+    max_shard_bytes: Optional[int] = None,
+) -> Dict[str, Optional[Dict[str, int]]]:
+    """
+    Собрать объединённый датасет из локальных источников.
+
+    Источники, у которых не изменились манифест и параметры сборки,
+    пропускаются, поэтому добавление источника пересобирает только его.
+    Итоговый датасет читается как
+    load_dataset("parquet", data_files={"train": f"{out_dir}/*/train-*.parquet",
+                                        "test": f"{out_dir}/*/test-*.parquet"}).
+
+    Args:
+        specs - источники
+        out_dir - корневая директория датасета
+        normalize - режим нормализации изображений
+        rows_per_shard - строк в одном Parquet-шарде
+        num_workers - число процессов для декодирования (None — без пула)
+        force - пересобрать все источники
+        max_shard_bytes - максимальный объём шарда в байтах (опционально)
+    Returns:
+        dict - имя источника -> число примеров по сплитам (None — пропущен)
+    """
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError("Source names must be unique")
+
+    os.makedirs(out_dir, exist_ok=True)
+    report: Dict[str, Optional[Dict[str, int]]] = {name: None for name in names}
+
+    pending: List[SourceSpec] = [
+        spec for spec in specs
+        if force or not is_up_to_date(spec, out_dir, normalize, rows_per_shard, max_shard_bytes)
+    ]
+
+    if not pending:
+        return report
+
+    executor = ProcessPoolExecutor(max_workers=num_workers) if num_workers and num_workers > 1 else None
+    try:
+        for spec in pending:
+            report[spec.name] = build_source(
+                spec,
+                out_dir,
+                normalize=normalize,
+                rows_per_shard=rows_per_shard,
+                executor=executor,
+                max_shard_bytes=max_shard_bytes,
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return report
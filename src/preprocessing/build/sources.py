@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import csv
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+from ..utils.hashing import content_hash
+
+# Правила формирования train/test из README (раздел Dataset)
+KEEP = "keep"      # сохраняем исходный сплит, val -> test
+FOLDER = "folder"  # папка test_folder -> test, остальные -> train
+RANDOM = "random"  # случайное разбиение (test_ratio, сид)
+
+SPLIT_RULES = (KEEP, FOLDER, RANDOM)
+
+DEFAULT_RULES: Dict[str, str] = {
+    "handwritten_essay": KEEP,
+    "cyrillic-handwriting-dataset": KEEP,
+    "school_notebooks": KEEP,
+    "HWR200": FOLDER,
+    "comnist": RANDOM,
+    "handwritten_ru_letters": RANDOM,
+    "synthetic_cyrillic_large_00_02": RANDOM,
+}
+
+MANIFEST_NAMES = ("labels.tsv", "labels.csv")
+_SPLIT_DIRS = {"train": "train", "test": "test", "val": "val", "valid": "val", "validation": "val"}
+
+
+@dataclass
+class SourceSpec:
+    """
+    Локальный источник данных.
+
+    Источник — директория с манифестом labels.tsv (или labels.csv)
+    с колонками path и text (и опционально source_split). Пути
+    изображений указываются относительно директории источника.
+    Если source_split не задан, он берётся из первой папки пути
+    (train / test / val).
+
+    Args:
+        name - имя источника (значение колонки dataset)
+        root - директория источника
+        rule - правило сплита: keep / folder / random
+        test_ratio - доля test для правила random
+        test_folder - папка, уходящая в test для правила folder
+        seed - сид для правила random
+    """
+
+    name: str
+    root: str
+    rule: Optional[str] = None
+    test_ratio: float = 0.3
+    test_folder: str = "4"
+    seed: int = 42
+
+    def __post_init__(self) -> None:
+        if self.rule is None:
+            self.rule = DEFAULT_RULES.get(self.name, RANDOM)
+        if self.rule not in SPLIT_RULES:
+            raise ValueError(f"rule must be one of {SPLIT_RULES}")
+        if not 0.0 <= self.test_ratio <= 1.0:
+            raise ValueError("test_ratio must be in [0, 1]")
+
+    @property
+    def manifest(self) -> str:
+        for name in MANIFEST_NAMES:
+            path = os.path.join(self.root, name)
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(
+            f"No {' or '.join(MANIFEST_NAMES)} found in source '{self.name}' ({self.root})"
+        )
+
+    def fingerprint(self) -> Dict[str, object]:
+        """
+        Всё, от чего зависит результат сборки источника.
+        """
+        stat = os.stat(self.manifest)
+        return {
+            "name": self.name,
+            "manifest": os.path.abspath(self.manifest),
+            "manifest_size": stat.st_size,
+            "manifest_mtime": stat.st_mtime_ns,
+            "rule": self.rule,
+            "test_ratio": self.test_ratio,
+            "test_folder": self.test_folder,
+            "seed": self.seed,
+        }
+
+    def assign_split(self, rel_path: str, source_split: Optional[str]) -> str:
+        """
+        Итоговый сплит примера по правилу источника.
+
+        Правило random детерминировано и не требует всего списка
+        примеров: позиция примера в [0, 1) берётся из хэша (seed, имя
+        источника, путь), поэтому сплит не зависит от порядка обхода.
+        """
+        if self.rule == KEEP:
+            if source_split is None:
+                raise ValueError(f"Source '{self.name}' has no source_split for '{rel_path}'")
+            return "train" if source_split == "train" else "test"
+
+        if self.rule == FOLDER:
+            folder = rel_path.replace("\\", "/").split("/", 1)[0]
+            return "test" if folder == self.test_folder else "train"
+
+        digest = content_hash(f"{self.seed}|{self.name}|{rel_path}".encode("utf-8"))
+        position = int(digest[:16], 16) / float(1 << 64)
+        return "test" if position < self.test_ratio else "train"
+
+    def iter_rows(self) -> Iterator[Dict[str, Optional[str]]]:
+        """
+        Потоково читать манифест источника.
+
+        Yields:
+            dict - path (абсолютный), rel_path, text, source_split, split
+        """
+        manifest = self.manifest
+        delimiter = "\t" if manifest.endswith(".tsv") else ","
+
+        with open(manifest, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
+            for row in reader:
+                rel_path = row["path"]
+                source_split = row.get("source_split") or None
+                if source_split is None:
+                    head = rel_path.replace("\\", "/").split("/", 1)[0].lower()
+                    source_split = _SPLIT_DIRS.get(head)
+
+                yield {
+                    "path": os.path.join(self.root, rel_path),
+                    "rel_path": rel_path,
+                    "text": row.get("text") or "",
+                    "source_split": source_split,
+                    "split": self.assign_split(rel_path, source_split),
+                }
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+
+def _parse_pairs(values: Optional[Sequence[str]], option: str) -> Dict[str, str]:
+    pairs: Dict[str, str] = {}
+    for value in values or []:
+        if "=" not in value:
+            raise SystemExit(f"{option} expects NAME=VALUE, got '{value}'")
+        name, val = value.split("=", 1)
+        pairs[name] = val
+    return pairs
+
+
+def _build_dataset(args: argparse.Namespace) -> None:
+    from .build import SourceSpec, build_dataset
+
+    roots = _parse_pairs(args.source, "--source")
+    if args.sources_dir:
+        for name in sorted(os.listdir(args.sources_dir)):
+            path = os.path.join(args.sources_dir, name)
+            if os.path.isdir(path) and not name.startswith("."):
+                roots.setdefault(name, path)
+
+    if not roots:
+        raise SystemExit("No sources given: use --source NAME=PATH or --sources-dir DIR")
+
+    rules = _parse_pairs(args.rule, "--rule")
+    specs: List[SourceSpec] = [
+        SourceSpec(name=name, root=root, rule=rules.get(name), seed=args.seed)
+        for name, root in roots.items()
+    ]
+
+    report = build_dataset(
+        specs,
+        args.out,
+        normalize=args.normalize,
+        rows_per_shard=args.rows_per_shard,
+        num_workers=args.workers,
+        force=args.force,
+        max_shard_bytes=args.max_shard_mb * 1024 * 1024 if args.max_shard_mb else None,
+    )
+    for name, counts in report.items():
+        status = "up to date" if counts is None else json.dumps(counts)
+        print(f"{name}: {status}")
+
+
+def _bench_imports(args: argparse.Namespace) -> None:
+    from .utils.profiling import DEFAULT_IMPORT_STATEMENTS, import_benchmark
+
+    statements = args.statement or DEFAULT_IMPORT_STATEMENTS
+    for row in import_benchmark(statements, repeats=args.repeats):
+        heavy = ", ".join(row["heavy_modules"]) or "-"
+        print(f"{row['median_sec']:8.3f}s  (min {row['min_sec']:.3f}s)  {row['statement']}")
+        print(f"          heavy modules: {heavy}")
+
+
+def _generate_synthetic(args: argparse.Namespace) -> None:
+    from .synthetic import LineRenderer, SyntheticLineGenerator, find_fonts, generate_dataset, load_corpus
+
+    fonts = [font for path in args.fonts for font in find_fonts(path)]
+
+    pipeline = None
+    if args.augment:
+        from .augmentation_pipeline import AugmentationPipeline
+        from .configs import PipelineConfig
+
+        if args.augment.endswith((".yaml", ".yml")):
+            config = PipelineConfig.from_yaml(path=args.augment)
+        else:
+            config = PipelineConfig.from_json(path=args.augment)
+        pipeline = AugmentationPipeline(config, seed=args.seed)
+
+    generator = SyntheticLineGenerator(
+        load_corpus(args.corpus),
+        LineRenderer(fonts, size_range=tuple(args.size_range)),
+        pipeline=pipeline,
+        seed=args.seed,
+        max_chars=args.max_chars,
+    )
+    paths = generate_dataset(
+        generator,
+        args.out,
+        args.num_lines,
+        start=args.start,
+        dataset=args.dataset,
+        split=args.split,
+        rows_per_shard=args.rows_per_shard,
+        num_workers=args.workers,
+    )
+    print(f"{args.num_lines} lines -> {len(paths)} shards in {args.out}")
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _autotune(args: argparse.Namespace) -> None:
+    from .configs import PipelineConfig
+    from .loaders import HFImageLoader
+    from .tuning import autotune
+
+    loader = HFImageLoader.from_shards(
+        args.data_files, split=args.split, streaming=False,
+        decode=args.decode, target_size=args.target_size,
+    )
+
+    config = None
+    if args.augment:
+        if args.augment.endswith((".yaml", ".yml")):
+            config = PipelineConfig.from_yaml(path=args.augment)
+        else:
+            config = PipelineConfig.from_json(path=args.augment)
+
+    weights = []
+    if args.weights:
+        with open(args.weights, encoding="utf-8") as f:
+            weights = json.load(f)
+
+    def log(result) -> None:
+        row = result.to_dict()
+        print(f"{row['samples_per_sec']:9.1f} samples/s  cpu {row['cpu_util']:5.1%}  "
+              f"workers={row['num_workers']} batch={row['batch_size']} "
+              f"cv2_threads={row['cv2_threads']} prefetch={row['prefetch_factor']}"
+              + (" weights=custom" if row["aug_weights"] else ""))
+
+    best, results, costs = autotune(
+        loader,
+        config,
+        budget_sec=args.budget,
+        trial_sec=args.trial_seconds,
+        sample_size=args.sample_size,
+        num_workers=_int_list(args.workers),
+        cv2_threads=_int_list(args.cv2_threads),
+        batch_sizes=_int_list(args.batch_sizes),
+        prefetch_factors=_int_list(args.prefetch),
+        weight_candidates=weights,
+        seed=args.seed,
+        log=log,
+    )
+
+    report = {
+        "best": best.to_dict(),
+        "trials": [r.to_dict() for r in results],
+        "augmentation_ms": {k: round(v, 3) for k, v in costs.items()},
+        "cpu_count": os.cpu_count(),
+    }
+    for name, ms in report["augmentation_ms"].items():
+        print(f"{name:>20}: {ms:8.3f} ms/image")
+    print("best:", json.dumps(report["best"], ensure_ascii=False))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cyrill", description="Cyrillic handwriting recognition project")
+    commands = parser.add_subparsers(dest="command")
+
+    build = commands.add_parser(
+        "build-dataset",
+        help="Собрать объединённый датасет (шардированный Parquet) из локальных источников",
+    )
+    build.add_argument("--source", action="append", metavar="NAME=PATH",
+                       help="источник (можно указать несколько раз)")
+    build.add_argument("--sources-dir", help="директория, каждая поддиректория которой — источник")
+    build.add_argument("--rule", action="append", metavar="NAME=RULE",
+                       help="правило сплита для источника: keep / folder / random")
+    build.add_argument("--out", required=True, help="директория датасета")
+    build.add_argument("--normalize", default="none", choices=["none", "gray", "crop"])
+    build.add_argument("--rows-per-shard", type=int, default=1000)
+    build.add_argument("--max-shard-mb", type=int, default=None,
+                       help="закрывать шард по объёму (МБ), а не только по числу строк")
+    build.add_argument("--workers", type=int, default=os.cpu_count())
+    build.add_argument("--seed", type=int, default=42)
+    build.add_argument("--force", action="store_true", help="пересобрать все источники")
+    build.set_defaults(func=_build_dataset)
+
+    bench = commands.add_parser(
+        "bench-imports",
+        help="Время холодного импорта пакета в свежем интерпретаторе",
+    )
+    bench.add_argument("--statement", action="append",
+                       help="код для замера (по умолчанию — набор типовых сценариев)")
+    bench.add_argument("--repeats", type=int, default=3)
+    bench.set_defaults(func=_bench_imports)
+
+    synth = commands.add_parser(
+        "generate-synthetic",
+        help="Сгенерировать синтетические рукописные строки (шардированный Parquet)",
+    )
+    synth.add_argument("--fonts", action="append", required=True,
+                       help="шрифт или директория со шрифтами (можно указать несколько раз)")
+    synth.add_argument("--corpus", required=True, help="текстовый файл, одна строка — один пример")
+    synth.add_argument("--out", required=True, help="директория для шардов")
+    synth.add_argument("--num-lines", type=int, required=True)
+    synth.add_argument("--start", type=int, default=0, help="первый индекс (для дозаписи)")
+    synth.add_argument("--augment", help="конфигурация аугментаций PipelineConfig (JSON или YAML)")
+    synth.add_argument("--size-range", type=int, nargs=2, default=[28, 48], metavar=("MIN", "MAX"))
+    synth.add_argument("--max-chars", type=int, default=64)
+    synth.add_argument("--dataset", default="synthetic")
+    synth.add_argument("--split", default="train")
+    synth.add_argument("--rows-per-shard", type=int, default=1000)
+    synth.add_argument("--workers", type=int, default=os.cpu_count())
+    synth.add_argument("--seed", type=int, default=42)
+    synth.set_defaults(func=_generate_synthetic)
+
+    tune = commands.add_parser(
+        "autotune",
+        help="Подобрать воркеры, потоки cv2, батч и prefetch по пропускной способности",
+    )
+    tune.add_argument("--data-files", required=True, help="шарды датасета (путь или glob)")
+    tune.add_argument("--split", default="train")
+    tune.add_argument("--augment", help="конфигурация аугментаций PipelineConfig (JSON или YAML)")
+    tune.add_argument("--weights", help="JSON-список наборов aug_weights для сравнения")
+    tune.add_argument("--decode", choices=["gray", "rgb"], help="прямое декодирование (см. HFImageLoader)")
+    tune.add_argument("--target-size", type=int)
+    tune.add_argument("--budget", type=float, default=300.0, help="бюджет поиска, секунды")
+    tune.add_argument("--trial-seconds", type=float, default=10.0)
+    tune.add_argument("--sample-size", type=int, default=2000)
+    tune.add_argument("--workers", default="0,2,4,8")
+    tune.add_argument("--cv2-threads", default="1,2")
+    tune.add_argument("--batch-sizes", default="8,16,32,64")
+    tune.add_argument("--prefetch", default="2,4")
+    tune.add_argument("--seed", type=int, default=0)
+    tune.add_argument("--out", help="JSON с лучшей конфигурацией и отчётом")
+    tune.set_defaults(func=_autotune)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        print("Hello from cyrill!")
+        return
+
+    args.func(args)
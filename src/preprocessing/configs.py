@@ -1,5 +1,42 @@
+import json
 from dataclasses import dataclass, field
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from .transforms.registry import create_transform, transform_name
+from .utils.hashing import config_hash
+
+
+def _to_plain(value: Any) -> Any:
+    """
+    Привести аргументы аугментации к JSON-совместимому виду.
+    """
+    if isinstance(value, (tuple, list)):
+        return [_to_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _to_plain(v) for k, v in value.items()}
+    if hasattr(value, "item") and callable(value.item):  # numpy-скаляры
+        return value.item()
+    return value
+
+
+def _from_plain(value: Any) -> Any:
+    """
+    Обратное преобразование: списки снова становятся кортежами
+    (все диапазоны аугментаций задаются кортежами).
+    """
+    if isinstance(value, list):
+        return tuple(_from_plain(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _from_plain(v) for k, v in value.items()}
+    return value
+
+
+def _require_yaml():
+    try:
+        import yaml
+    except ImportError as e:
+        raise ImportError("PyYAML is required for YAML configs: pip install pyyaml") from e
+    return yaml
 
 
 @dataclass
@@ -24,18 +61,36 @@ class PipelineConfig:
 
         return_params:
             Нужно ли возвращать параметры аугментации в выходном примере.
+
+        compact_params:
+            Возвращать вместо полного dict параметров только скаляры
+            по схеме аугментации (param_schema). Удобно для collate,
+            логов и выгрузки в Arrow (см. MetadataBuffer).
+
+        tile_size:
+            Размер тайла для локальных аугментаций (tileable) на больших
+            страницах. None — изображения обрабатываются целиком.
+
+        tile_workers:
+            Число потоков для обработки тайлов одного изображения.
     """
 
     p_aug: float = 0.5
     augmentations: Dict[str, Any] = field(default_factory=dict)
     aug_weights: Dict[str, float] = field(default_factory=dict)
     return_params: bool = True
+    compact_params: bool = False
+    tile_size: Optional[int] = None
+    tile_workers: Optional[int] = None
 
     def __post_init__(self) -> None:
         # Проверка p_aug
         if not 0.0 <= self.p_aug <= 1.0:
             raise ValueError("p_aug must be in [0, 1]")
 
+        if self.tile_size is not None and self.tile_size <= 0:
+            raise ValueError("tile_size must be > 0")
+
         # Проверка аугментаций
         if not self.augmentations:
             raise ValueError("augmentations must not be empty")
@@ -61,3 +116,97 @@ class PipelineConfig:
 
         if not 0.98 <= total_weight <= 1.01:
             raise ValueError("Sum of aug_weights must be == 1")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Декларативное описание конфигурации.
+
+        Аугментации описываются зарегистрированным именем и аргументами
+        конструктора, поэтому результат JSON-сериализуем и по нему можно
+        заново собрать те же объекты (например, в spawn-воркере).
+        """
+        augmentations = {
+            key: {
+                "type": transform_name(type(aug)),
+                "params": _to_plain(aug.init_args),
+            }
+            for key, aug in self.augmentations.items()
+        }
+        data = {
+            "p_aug": float(self.p_aug),
+            "augmentations": augmentations,
+            "aug_weights": {k: float(v) for k, v in self.aug_weights.items()},
+            "return_params": bool(self.return_params),
+        }
+        if self.compact_params:
+            data["compact_params"] = True
+        # Тайлинг не меняет набор аугментаций — добавляем только если включён,
+        # чтобы хэш прежних конфигураций не изменился
+        if self.tile_size is not None:
+            data["tile_size"] = int(self.tile_size)
+            data["tile_workers"] = self.tile_workers
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PipelineConfig":
+        """
+        Собрать конфигурацию из описания to_dict().
+        """
+        augmentations = {
+            key: create_transform(spec["type"], **_from_plain(spec.get("params", {})))
+            for key, spec in data["augmentations"].items()
+        }
+        options = {k: v for k, v in data.items() if k != "augmentations"}
+        return cls(augmentations=augmentations, **options)
+
+    def to_json(self, path: Optional[str] = None, indent: Optional[int] = 2) -> str:
+        """
+        Сериализовать в JSON (и записать в path, если он задан).
+        """
+        text = json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    @classmethod
+    def from_json(cls, text: Optional[str] = None, path: Optional[str] = None) -> "PipelineConfig":
+        if path is not None:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        if text is None:
+            raise ValueError("Either text or path must be provided")
+        return cls.from_dict(json.loads(text))
+
+    def to_yaml(self, path: Optional[str] = None) -> str:
+        """
+        Сериализовать в YAML (нужен PyYAML).
+        """
+        yaml = _require_yaml()
+        text = yaml.safe_dump(self.to_dict(), allow_unicode=True, sort_keys=False)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    @classmethod
+    def from_yaml(cls, text: Optional[str] = None, path: Optional[str] = None) -> "PipelineConfig":
+        yaml = _require_yaml()
+        if path is not None:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        if text is None:
+            raise ValueError("Either text or path must be provided")
+        return cls.from_dict(yaml.safe_load(text))
+
+    def config_hash(self) -> str:
+        """
+        Хэш канонического описания конфигурации. Не зависит от того,
+        заданы ли диапазоны списками или кортежами — стабильный ключ для
+        кеширования между запусками.
+
+        Порядок аугментаций входит в хэш: AugmentationPipeline выбирает
+        аугментацию по этому порядку, поэтому конфигурации с одинаковыми
+        аугментациями в разном порядке дают разные выходы при том же seed.
+        """
+        return config_hash({"config": self.to_dict(), "order": list(self.augmentations)})
@@ -0,0 +1,6 @@
+from .hamming_index import (HammingIndex, cross_split_duplicates,
+                            duplicates_report, hamming_distance)
+from .phash import phash_batch, phash_loader
+
+__all__ = ['HammingIndex', 'cross_split_duplicates', 'duplicates_report',
+           'hamming_distance', 'phash_batch', 'phash_loader']
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def hamming_distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Поэлементное расстояние Хэмминга между массивами uint64-хэшей.
+    """
+    return np.bitwise_count(np.bitwise_xor(a, b)).astype(np.int64)
+
+
+class HammingIndex:
+    """
+    Multi-index hashing для поиска хэшей на расстоянии Хэмминга <= max_distance.
+
+    64-битный хэш режется на max_distance + 1 блоков. По принципу
+    Дирихле у двух хэшей на расстоянии <= max_distance хотя бы один
+    блок совпадает точно, поэтому кандидаты ищутся бинарным поиском
+    по отсортированным значениям каждого блока, а точное расстояние
+    проверяется только для них. Всё выполняется векторно в numpy.
+
+    Args:
+        hashes - np.ndarray uint64 с хэшами индекса
+        max_distance - максимальное расстояние Хэмминга
+        bits - число значимых бит в хэше
+        chunk_size - число запросов, обрабатываемых за раз (ограничивает память)
+    """
+
+    def __init__(
+        self,
+        hashes: np.ndarray,
+        max_distance: int = 4,
+        bits: int = 64,
+        chunk_size: int = 65536,
+    ):
+        if not 0 <= max_distance < bits:
+            raise ValueError("max_distance must be in [0, bits)")
+
+        self.hashes = np.asarray(hashes, dtype=np.uint64)
+        self.max_distance = max_distance
+        self.bits = bits
+        self.chunk_size = chunk_size
+
+        # Границы блоков: max_distance + 1 почти равных частей
+        edges = np.linspace(0, bits, max_distance + 2).astype(int)
+        self._blocks: List[Tuple[np.uint64, np.uint64, np.ndarray, np.ndarray]] = []
+        for lo, hi in zip(edges[:-1], edges[1:]):
+            shift = np.uint64(lo)
+            mask = np.uint64((1 << int(hi - lo)) - 1)
+            keys = (self.hashes >> shift) & mask
+            order = np.argsort(keys, kind="stable")
+            self._blocks.append((shift, mask, keys[order], order))
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def _query_chunk(self, queries: np.ndarray) -> np.ndarray:
+        found = []
+        for shift, mask, sorted_keys, order in self._blocks:
+            keys = (queries >> shift) & mask
+            left = np.searchsorted(sorted_keys, keys, side="left")
+            right = np.searchsorted(sorted_keys, keys, side="right")
+            counts = right - left
+            total = int(counts.sum())
+            if total == 0:
+                continue
+
+            # Разворачиваем диапазоны [left, right) в плоский список кандидатов
+            qi = np.repeat(np.arange(len(queries)), counts)
+            starts = np.repeat(left - (np.cumsum(counts) - counts), counts)
+            ri = order[np.arange(total) + starts]
+
+            dist = hamming_distance(queries[qi], self.hashes[ri])
+            keep = dist <= self.max_distance
+            found.append(np.stack([qi[keep], ri[keep], dist[keep]], axis=1))
+
+        if not found:
+            return np.empty((0, 3), dtype=np.int64)
+
+        pairs = np.concatenate(found)
+        # Одна и та же пара может совпасть в нескольких блоках
+        return np.unique(pairs, axis=0)
+
+    def query(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Найти все хэши индекса на расстоянии <= max_distance от запросов.
+
+        Args:
+            hashes - np.ndarray uint64 запросов
+        Returns:
+            pairs - np.ndarray (K, 3): индекс запроса, индекс в индексе, расстояние
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        parts = []
+        for start in range(0, len(hashes), self.chunk_size):
+            chunk = self._query_chunk(hashes[start:start + self.chunk_size])
+            chunk[:, 0] += start
+            parts.append(chunk)
+
+        if not parts:
+            return np.empty((0, 3), dtype=np.int64)
+        return np.concatenate(parts)
+
+    def self_pairs(self) -> np.ndarray:
+        """
+        Все пары (i, j, distance), i < j, внутри самого индекса.
+        """
+        pairs = self.query(self.hashes)
+        return pairs[pairs[:, 0] < pairs[:, 1]]
+
+
+def cross_split_duplicates(
+    hashes: np.ndarray,
+    splits: Sequence[str],
+    max_distance: int = 4,
+    train_split: str = "train",
+    test_split: str = "test",
+) -> np.ndarray:
+    """
+    Найти почти-дубликаты между train и test.
+
+    Args:
+        hashes - pHash всех изображений
+        splits - сплит каждого изображения
+        max_distance - максимальное расстояние Хэмминга
+        train_split, test_split - имена сплитов
+    Returns:
+        pairs - np.ndarray (K, 3): индекс train, индекс test, расстояние
+            (индексы — позиции в исходном массиве hashes)
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    splits = np.asarray(splits)
+    train_idx = np.flatnonzero(splits == train_split)
+    test_idx = np.flatnonzero(splits == test_split)
+
+    index = HammingIndex(hashes[train_idx], max_distance=max_distance)
+    pairs = index.query(hashes[test_idx])
+
+    return np.stack([train_idx[pairs[:, 1]], test_idx[pairs[:, 0]], pairs[:, 2]], axis=1)
+
+
+def duplicates_report(
+    pairs: np.ndarray,
+    names: Sequence[str],
+    datasets: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Таблица найденных пар для анализа.
+
+    Args:
+        pairs - результат cross_split_duplicates / self_pairs
+        names - имена изображений (по позициям)
+        datasets - источник каждого изображения (опционально)
+    """
+    names = np.asarray(names, dtype=object)
+    frame = pd.DataFrame({
+        "left": names[pairs[:, 0]],
+        "right": names[pairs[:, 1]],
+        "distance": pairs[:, 2],
+    })
+    if datasets is not None:
+        datasets = np.asarray(datasets, dtype=object)
+        frame["left_dataset"] = datasets[pairs[:, 0]]
+        frame["right_dataset"] = datasets[pairs[:, 1]]
+    return frame.sort_values("distance", kind="stable").reset_index(drop=True)
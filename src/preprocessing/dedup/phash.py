@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from ..loaders import HFImageLoader
+from ..utils.image import to_gray
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """
+    Ортонормированная матрица DCT-II размера (n, n).
+    """
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    mat = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    mat[0] /= np.sqrt(2.0)
+    return mat.astype(np.float32)
+
+
+def phash_batch(
+    images: Sequence[Image.Image | np.ndarray],
+    hash_size: int = 8,
+    highfreq_factor: int = 4,
+) -> np.ndarray:
+    """
+    Перцептивный хэш (DCT pHash) для батча изображений.
+
+    Каждое изображение уменьшается до (hash_size * highfreq_factor)^2,
+    после чего DCT считается для всего батча одним матричным
+    умножением. Бит хэша — коэффициент низкочастотного блока
+    hash_size x hash_size больше медианы блока.
+
+    Args:
+        images - Изображения в формате PIL.Image или numpy.ndarray
+        hash_size - сторона низкочастотного блока (8 -> 64-битный хэш)
+        highfreq_factor - во сколько раз миниатюра больше блока
+    Returns:
+        hashes - np.ndarray uint64 формы (N,)
+    """
+    if hash_size * hash_size > 64:
+        raise ValueError("hash_size must be <= 8 for 64-bit hashes")
+    if len(images) == 0:
+        return np.empty(0, dtype=np.uint64)
+
+    side = hash_size * highfreq_factor
+    thumbs = np.stack([
+        cv2.resize(to_gray(image), (side, side), interpolation=cv2.INTER_AREA)
+        for image in images
+    ]).astype(np.float32)
+
+    dct = _dct_matrix(side)[:hash_size]
+    # (N, side, side) -> (N, hash_size, hash_size)
+    low = dct @ thumbs @ dct.T
+    low = low.reshape(len(images), -1)
+
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    bits = low > median
+
+    weights = np.left_shift(np.uint64(1), np.arange(bits.shape[1], dtype=np.uint64))
+    return (bits.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+
+
+def phash_loader(
+    loader: HFImageLoader | Iterable[Tuple[np.ndarray, str, str]],
+    batch_size: int = 256,
+    hash_size: int = 8,
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Посчитать pHash для всех изображений HFImageLoader.
+
+    Args:
+        loader - HFImageLoader (или итератор (image, target, image_name))
+        batch_size - сколько изображений хэшировать за один вызов
+        hash_size - сторона низкочастотного блока
+    Returns:
+        hashes - np.ndarray uint64
+        names - имена изображений в том же порядке
+    """
+    parts: List[np.ndarray] = []
+    names: List[str] = []
+    batch: List[np.ndarray] = []
+
+    for image, _, name in loader:
+        batch.append(image)
+        names.append(name)
+        if len(batch) >= batch_size:
+            parts.append(phash_batch(batch, hash_size=hash_size))
+            batch = []
+
+    if batch:
+        parts.append(phash_batch(batch, hash_size=hash_size))
+
+    hashes = np.concatenate(parts) if parts else np.empty(0, dtype=np.uint64)
+    return hashes, names
@@ -0,0 +1,4 @@
+from .incremental import evaluate_incremental
+from .store import PredictionStore
+
+__all__ = ['evaluate_incremental', 'PredictionStore']
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from datasets import Dataset
+from datasets import Image as ImageFeature
+
+from ..metrics import ErrorRateAccumulator
+from ..utils.hashing import config_hash, image_hash
+from .store import PredictionStore
+
+
+def _column(batch: Dict[str, List[Any]], name: Optional[str], n: int) -> List[Any]:
+    if name is not None and name in batch:
+        return batch[name]
+    return [None] * n
+
+
+def evaluate_incremental(
+    dataset: Dataset,
+    recognize: Callable[[List[Any]], List[str]],
+    store: PredictionStore,
+    model_id: str,
+    revision: Optional[str] = None,
+    preprocess_config: Any = None,
+    datasets: Optional[Sequence[str]] = None,
+    source_splits: Optional[Sequence[str]] = None,
+    batch_size: int = 32,
+    image_column: str = "image",
+    text_column: str = "text",
+    dataset_column: str = "dataset",
+    source_split_column: str = "source_split",
+    accumulator: Optional[ErrorRateAccumulator] = None,
+) -> Dict[str, Any]:
+    """
+    Оценка модели с кешированием предсказаний.
+
+    Инференс запускается только для изображений, которых ещё нет
+    в store для ключа (model_id, revision, хэш preprocess_config).
+    Метрики всегда пересчитываются по кешу, поэтому смена нормализации
+    или подмножества не требует повторной генерации.
+
+    Args:
+        dataset - HuggingFace Dataset со сплитом для оценки
+        recognize - функция список изображений -> список текстов
+            (например, RecognitionEngine)
+        store - хранилище предсказаний
+        model_id - идентификатор модели
+        revision - ревизия модели (опционально)
+        preprocess_config - JSON-сериализуемая конфигурация препроцессинга
+            (или готовый хэш-строка)
+        datasets - оценивать только эти значения колонки dataset
+        source_splits - оценивать только эти значения колонки source_split
+        batch_size - размер батча для хэширования и инференса
+        accumulator - аккумулятор метрик (например, с другой нормализацией)
+    Returns:
+        dict - метрики по корпусу, разбивка по dataset и статистика кеша
+    """
+    cfg_hash = preprocess_config if isinstance(preprocess_config, str) else config_hash(preprocess_config)
+
+    # 1) фильтрация только по лёгким колонкам, без декодирования изображений
+    if datasets is not None:
+        allowed = set(datasets)
+        dataset = dataset.filter(lambda v: v in allowed, input_columns=dataset_column)
+    if source_splits is not None:
+        allowed_splits = set(source_splits)
+        dataset = dataset.filter(lambda v: v in allowed_splits, input_columns=source_split_column)
+
+    # 2) хэши изображений по закодированным байтам
+    raw = dataset
+    if isinstance(raw.features[image_column], ImageFeature):
+        raw = raw.cast_column(image_column, ImageFeature(decode=False))
+
+    hashes: List[str] = []
+    refs: List[Optional[str]] = []
+    groups: List[Optional[str]] = []
+    splits: List[Optional[str]] = []
+    for batch in raw.iter(batch_size=batch_size):
+        n = len(batch[image_column])
+        hashes.extend(image_hash(v) for v in batch[image_column])
+        refs.extend(batch[text_column])
+        groups.extend(_column(batch, dataset_column, n))
+        splits.extend(_column(batch, source_split_column, n))
+
+    # 3) инференс только для отсутствующих ключей
+    missing = set(store.missing(model_id, revision, cfg_hash, hashes))
+    positions = []
+    for pos, h in enumerate(hashes):
+        if h in missing:
+            positions.append(pos)
+            missing.discard(h)
+
+    for start in range(0, len(positions), batch_size):
+        chunk = positions[start:start + batch_size]
+        images = dataset.select(chunk)[image_column]
+        preds = recognize(images)
+        store.add(
+            model_id,
+            revision,
+            cfg_hash,
+            [hashes[p] for p in chunk],
+            preds,
+            references=[refs[p] for p in chunk],
+            datasets=[groups[p] for p in chunk],
+            source_splits=[splits[p] for p in chunk],
+        )
+        # сохраняем после каждого батча, чтобы прерванный прогон не терялся
+        store.flush()
+
+    # 4) метрики по кешу
+    cached = store.lookup(model_id, revision, cfg_hash, hashes)
+    hyps = [cached[h] for h in hashes]
+
+    acc = accumulator if accumulator is not None else ErrorRateAccumulator()
+    acc.update(refs, hyps, groups=[str(g) for g in groups])
+
+    return {
+        "model": model_id,
+        "revision": revision,
+        "config_hash": cfg_hash,
+        "samples": len(hashes),
+        "inferred": len(positions),
+        "cached": len(hashes) - len(positions),
+        **acc.compute(),
+        "groups": acc.compute_groups(),
+    }
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import os
+import time
+import uuid
+from glob import glob
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+KEY_COLUMNS = ["model_id", "revision", "config_hash", "image_hash"]
+VALUE_COLUMNS = ["prediction", "reference", "dataset", "source_split"]
+COLUMNS = KEY_COLUMNS + VALUE_COLUMNS
+
+
+def _part_order(path: str) -> Tuple[int, str]:
+    # part-<time_ns>-<uuid>.parquet; числовое сравнение оставляет старые
+    # имена с секундной меткой (YYYYmmddHHMMSS) раньше новых
+    stamp = os.path.basename(path).split("-")[1]
+    return (int(stamp) if stamp.isdigit() else -1, path)
+
+
+def _parts(path: str) -> List[str]:
+    """
+    Part-файлы хранилища в порядке записи.
+    """
+    return sorted(glob(os.path.join(path, "part-*.parquet")), key=_part_order)
+
+
+class PredictionStore:
+    """
+    Локальное хранилище предсказаний модели в Parquet.
+
+    Предсказание адресуется ключом (model_id, revision, config_hash,
+    image_hash): модель и её ревизия, хэш конфигурации препроцессинга
+    и хэш содержимого изображения. Новые записи дописываются отдельными
+    part-файлами, при чтении более поздняя запись перекрывает раннюю.
+
+    Args:
+        path - директория хранилища (создаётся при необходимости)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        parts = _parts(path)
+        if parts:
+            frame = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+            frame = frame.drop_duplicates(subset=KEY_COLUMNS, keep="last")
+        else:
+            frame = pd.DataFrame(columns=COLUMNS)
+
+        self._frame = self._missing_to_none(frame).reset_index(drop=True)
+        self._pending: List[Dict[str, Optional[str]]] = []
+        self._last_stamp = max((_part_order(p)[0] for p in parts), default=0)
+        self._index = self._build_index(self._frame)
+
+    @staticmethod
+    def _missing_to_none(frame: pd.DataFrame) -> pd.DataFrame:
+        # Строковые колонки pandas (и Parquet после concat) хранят None как NaN;
+        # ключ с revision=None должен оставаться None, иначе lookup промахивается
+        frame = frame.astype(object)
+        return frame.where(frame.notna(), None)
+
+    @staticmethod
+    def _build_index(frame: pd.DataFrame) -> Dict[tuple, str]:
+        keys = zip(*(frame[c].tolist() for c in KEY_COLUMNS))
+        return dict(zip(keys, frame["prediction"].tolist()))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(
+        self,
+        model_id: str,
+        revision: Optional[str],
+        config_hash: str,
+        image_hashes: Iterable[str],
+    ) -> Dict[str, str]:
+        """
+        Найти сохранённые предсказания.
+
+        Returns:
+            dict image_hash -> prediction (только найденные)
+        """
+        out = {}
+        for h in image_hashes:
+            pred = self._index.get((model_id, revision, config_hash, h))
+            if pred is not None:
+                out[h] = pred
+        return out
+
+    def missing(
+        self,
+        model_id: str,
+        revision: Optional[str],
+        config_hash: str,
+        image_hashes: Iterable[str],
+    ) -> List[str]:
+        """
+        Хэши изображений, для которых ещё нет предсказаний (без повторов).
+        """
+        seen = set()
+        out = []
+        for h in image_hashes:
+            if h in seen:
+                continue
+            seen.add(h)
+            if (model_id, revision, config_hash, h) not in self._index:
+                out.append(h)
+        return out
+
+    def add(
+        self,
+        model_id: str,
+        revision: Optional[str],
+        config_hash: str,
+        image_hashes: Sequence[str],
+        predictions: Sequence[str],
+        references: Optional[Sequence[Optional[str]]] = None,
+        datasets: Optional[Sequence[Optional[str]]] = None,
+        source_splits: Optional[Sequence[Optional[str]]] = None,
+    ) -> None:
+        """
+        Добавить предсказания. На диск они попадут после flush().
+        """
+        n = len(image_hashes)
+        if len(predictions) != n:
+            raise ValueError("image_hashes and predictions must have the same length")
+
+        references = references if references is not None else [None] * n
+        datasets = datasets if datasets is not None else [None] * n
+        source_splits = source_splits if source_splits is not None else [None] * n
+
+        for h, pred, ref, ds, ss in zip(image_hashes, predictions, references, datasets, source_splits):
+            self._pending.append({
+                "model_id": model_id,
+                "revision": revision,
+                "config_hash": config_hash,
+                "image_hash": h,
+                "prediction": pred,
+                "reference": ref,
+                "dataset": ds,
+                "source_split": ss,
+            })
+            self._index[(model_id, revision, config_hash, h)] = pred
+
+    def flush(self) -> None:
+        """
+        Записать накопленные предсказания в новый part-файл.
+        """
+        if not self._pending:
+            return
+
+        part = pd.DataFrame(self._pending, columns=COLUMNS)
+        # Наносекундная метка, строго возрастающая в пределах хранилища:
+        # порядок файлов совпадает с порядком записи
+        self._last_stamp = max(time.time_ns(), self._last_stamp + 1)
+        name = f"part-{self._last_stamp:020d}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp = os.path.join(self.path, f".{name}.tmp")
+        part.to_parquet(tmp, index=False)
+        os.replace(tmp, os.path.join(self.path, name))
+
+        self._frame = self._missing_to_none(pd.concat([self._frame, part], ignore_index=True))
+        self._frame = self._frame.drop_duplicates(subset=KEY_COLUMNS, keep="last")
+        self._frame = self._frame.reset_index(drop=True)
+        self._pending = []
+
+    def compact(self) -> None:
+        """
+        Слить все part-файлы в один.
+        """
+        self.flush()
+        old = _parts(self.path)
+        self._pending = self._frame.to_dict("records")
+        self._frame = self._frame.iloc[0:0]
+        self.flush()
+        for p in old:
+            os.remove(p)
+
+    def frame(
+        self,
+        model_id: Optional[str] = None,
+        revision: Optional[str] = None,
+        config_hash: Optional[str] = None,
+        datasets: Optional[Sequence[str]] = None,
+        source_splits: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Срез сохранённых предсказаний (включая ещё не записанные).
+
+        Args:
+            model_id, revision, config_hash - фильтры по ключу
+            datasets - оставить только эти значения колонки dataset
+            source_splits - оставить только эти значения колонки source_split
+        """
+        frame = self._frame
+        if self._pending:
+            frame = pd.concat([frame, pd.DataFrame(self._pending, columns=COLUMNS)], ignore_index=True)
+            frame = self._missing_to_none(frame).drop_duplicates(subset=KEY_COLUMNS, keep="last")
+
+        mask = pd.Series(True, index=frame.index)
+        if model_id is not None:
+            mask &= frame["model_id"] == model_id
+        if revision is not None:
+            mask &= frame["revision"] == revision
+        if config_hash is not None:
+            mask &= frame["config_hash"] == config_hash
+        if datasets is not None:
+            mask &= frame["dataset"].isin(list(datasets))
+        if source_splits is not None:
+            mask &= frame["source_split"].isin(list(source_splits))
+
+        return frame[mask].reset_index(drop=True)
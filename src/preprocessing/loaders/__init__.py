@@ -1,3 +1,4 @@
+from .decode import decode_image, reduction_factor
 from .image_loader import HFImageLoader
 
-__all__ = ['HFImageLoader']
+__all__ = ['HFImageLoader', 'decode_image', 'reduction_factor']
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import io
+from typing import Any, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from ..sampling.size_index import read_image_size
+
+DECODE_MODES = ("gray", "rgb")
+DECODE_BACKENDS = ("cv2", "pil")
+
+# Тег EXIF Orientation (0x0112) и поворот, который его отменяет
+ORIENTATION = Image.ExifTags.Base.Orientation
+_EXIF_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# Масштабы, которые умеют декодеры без полного декодирования:
+# JPEG — масштабирование DCT (1/2, 1/4, 1/8), OpenCV — IMREAD_REDUCED_*
+REDUCTION_FACTORS = (8, 4, 2, 1)
+
+_CV2_FLAGS = {
+    ("gray", 1): cv2.IMREAD_GRAYSCALE,
+    ("gray", 2): cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    ("gray", 4): cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    ("gray", 8): cv2.IMREAD_REDUCED_GRAYSCALE_8,
+    ("rgb", 1): cv2.IMREAD_COLOR,
+    ("rgb", 2): cv2.IMREAD_REDUCED_COLOR_2,
+    ("rgb", 4): cv2.IMREAD_REDUCED_COLOR_4,
+    ("rgb", 8): cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+def reduction_factor(
+    size: Tuple[int, int],
+    target_size: Optional[int | Tuple[int, int]],
+) -> int:
+    """
+    Максимальный масштаб уменьшения при декодировании, при котором
+    изображение не становится меньше целевого ни по одной стороне.
+
+    Args:
+        size - (width, height) исходного изображения
+        target_size - сторона или (width, height), к которым изображение
+            будет приведено потребителем (например, 384 для TrOCR)
+    Returns:
+        int - 1, 2, 4 или 8
+    """
+    if target_size is None:
+        return 1
+    if isinstance(target_size, int):
+        target_size = (target_size, target_size)
+
+    width, height = size
+    target_w, target_h = target_size
+    for factor in REDUCTION_FACTORS:
+        if width // factor >= target_w and height // factor >= target_h:
+            return factor
+    return 1
+
+
+def _bytes_of(value: Any) -> bytes:
+    if isinstance(value, dict):
+        if value.get("bytes") is not None:
+            return value["bytes"]
+        value = value["path"]
+    if isinstance(value, str):
+        with open(value, "rb") as f:
+            return f.read()
+    return bytes(value)
+
+
+def decode_image(
+    value: Any,
+    mode: str = "rgb",
+    target_size: Optional[int | Tuple[int, int]] = None,
+    backend: str = "cv2",
+) -> np.ndarray:
+    """
+    Декодировать закодированное изображение сразу в ndarray нужного вида,
+    при возможности — в уменьшенном разрешении.
+
+    cv2: imdecode с IMREAD_REDUCED_* (для JPEG уменьшение делается
+    в DCT, без декодирования полного разрешения). PIL: draft для JPEG,
+    reduce для остальных форматов.
+
+    Args:
+        value - dict {"bytes", "path"} (datasets.Image(decode=False)), bytes или путь
+        mode - gray (H, W) или rgb (H, W, 3)
+        target_size - целевой размер потребителя (см. reduction_factor);
+            None — полное разрешение
+        backend - cv2 или pil
+    Returns:
+        np.ndarray uint8
+    """
+    if mode not in DECODE_MODES:
+        raise ValueError(f"mode must be one of {DECODE_MODES}")
+    if backend not in DECODE_BACKENDS:
+        raise ValueError(f"backend must be one of {DECODE_BACKENDS}")
+
+    data = _bytes_of(value)
+    factor = reduction_factor(read_image_size(data), target_size) if target_size is not None else 1
+
+    if backend == "cv2":
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), _CV2_FLAGS[(mode, factor)])
+        if image is None:
+            raise ValueError("Failed to decode image")
+        if mode == "rgb":
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return image
+
+    with Image.open(io.BytesIO(data)) as img:
+        pil_mode = "L" if mode == "gray" else "RGB"
+        # Ориентацию читаем до convert / reduce: они не сохраняют EXIF
+        transpose = _EXIF_TRANSPOSE.get(img.getexif().get(ORIENTATION))
+        if factor > 1:
+            if img.format == "JPEG":
+                img.draft(pil_mode, (img.width // factor, img.height // factor))
+            else:
+                # reduce не поддерживает палитровые (P) и однобитные (1)
+                # изображения, поэтому сначала приводим к целевому режиму
+                img = img.convert(pil_mode).reduce(factor)
+        img = img.convert(pil_mode)
+        # Как cv2.imdecode и datasets.Image: применяем EXIF Orientation
+        if transpose is not None:
+            img = img.transpose(transpose)
+        return np.asarray(img)
@@ -1,22 +1,46 @@
 from __future__ import annotations
 
-from typing import Iterator, Tuple, Optional
+import io
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
 
 import numpy as np
-from datasets import Dataset, DatasetDict
+from datasets import (Dataset, DatasetDict, Image, IterableDataset,
+                      IterableDatasetDict, load_dataset)
+from datasets.distributed import split_dataset_by_node
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+from ..utils.hashing import stable_id
+from .decode import DECODE_MODES, ORIENTATION, decode_image
 
 
 class HFImageLoader:
     """
     Загрузчик изображений из HuggingFace Dataset или DatasetDict.
 
+    Поддерживает и стриминг: IterableDataset / IterableDatasetDict
+    (load_dataset(..., streaming=True)) и локальные шарды (from_shards).
+    В стриминге нет len() и доступа по индексу — только итерация,
+    а вместо позиционного idx у примера есть стабильный sample_id.
+
     Args:
-        dataset - HuggingFace Dataset или DatasetDict,
-            с которым будем работать.
+        dataset - HuggingFace Dataset / DatasetDict / IterableDataset /
+            IterableDatasetDict, с которым будем работать.
         split (default train) - имя сэмпал для загрузки (если DatasetDict).
         image_column (default image) - поле с картинкой для обработки.
             Может быть datasets.Image / Pillow.Image
         target_column (default text)
+        image_id_column - поле с идентификатором изображения (опционально)
+        shuffle_buffer - размер буфера перемешивания для стриминга
+            (None — без перемешивания); порядок шардов тоже перемешивается
+        seed - seed перемешивания (эпоха добавляется через set_epoch)
+        rank, world_size - детерминированное распределение шардов между
+            узлами / процессами: каждый получает свою непересекающуюся часть
+        decode - gray / rgb: читать закодированные байты из Arrow и декодировать
+            через cv2.imdecode сразу в нужный ndarray (None — PIL, как есть)
+        target_size - целевой размер потребителя (например, 384): декодирование
+            в уменьшенном разрешении (1/2, 1/4, 1/8), если изображение заметно больше
+        decode_backend - cv2 или pil (draft / reduce)
 
     This loader yields:
         image (np.ndarray), target, image_name
@@ -24,13 +48,20 @@ class HFImageLoader:
 
     def __init__(
         self,
-        dataset: Dataset | DatasetDict,
+        dataset: Dataset | DatasetDict | IterableDataset | IterableDatasetDict,
         split: str = "train",
         image_column: str = "image",
         target_column: str = "text",
         image_id_column: Optional[str] = None,
+        shuffle_buffer: Optional[int] = None,
+        seed: int = 42,
+        rank: int = 0,
+        world_size: int = 1,
+        decode: Optional[str] = None,
+        target_size: Optional[int | Tuple[int, int]] = None,
+        decode_backend: str = "cv2",
     ):
-        if isinstance(dataset, DatasetDict):
+        if isinstance(dataset, (DatasetDict, IterableDatasetDict)):
             if split not in dataset:
                 raise ValueError(f"Split '{split}' not found in DatasetDict")
             self.dataset = dataset[split]
@@ -39,33 +70,150 @@ class HFImageLoader:
             self.dataset = dataset
             self.split = "data"
 
+        if not 0 <= rank < world_size:
+            raise ValueError("rank must be in [0, world_size)")
+        if decode is not None and decode not in DECODE_MODES:
+            raise ValueError(f"decode must be one of {DECODE_MODES}")
+
         self.image_column = image_column
         self.target_column = target_column
         self.image_id_column = image_id_column
+        self.shuffle_buffer = shuffle_buffer
+        self.seed = seed
+        self.decode = decode
+        self.target_size = target_size
+        self.decode_backend = decode_backend
+        self.streaming = isinstance(self.dataset, IterableDataset)
+
+        if self.streaming:
+            if world_size > 1:
+                self.dataset = split_dataset_by_node(self.dataset, rank=rank, world_size=world_size)
+            if shuffle_buffer:
+                self.dataset = self.dataset.shuffle(seed=seed, buffer_size=shuffle_buffer)
+        else:
+            if world_size > 1:
+                self.dataset = self.dataset.shard(num_shards=world_size, index=rank, contiguous=True)
+
+        # Декодируем сами в обоих режимах: так sample_id считается по исходным
+        # байтам (одинаково для стриминга и map-style), без хэширования пикселей
+        self._image_mode: Optional[str] = None
+        features = self.dataset.features
+        feature = features.get(image_column) if features is not None else None
+        if isinstance(feature, Image) and feature.decode:
+            self._image_mode = feature.mode
+            self.dataset = self.dataset.cast_column(image_column, Image(decode=False))
+
+    @classmethod
+    def from_shards(
+        cls,
+        data_files: str | Sequence[str] | Dict[str, Any],
+        split: str = "train",
+        format: str = "parquet",
+        streaming: bool = True,
+        **kwargs: Any,
+    ) -> "HFImageLoader":
+        """
+        Загрузчик поверх локальных шардов (например, из build-dataset).
+
+        Args:
+            data_files - путь, glob или список файлов (или dict сплитов)
+            split - сплит
+            format - формат шардов для load_dataset (parquet, arrow, ...)
+            streaming - читать потоково, без Arrow-кеша на диске
+            kwargs - аргументы HFImageLoader
+        """
+        dataset = load_dataset(format, data_files=data_files, split=split, streaming=streaming)
+        loader = cls(dataset, **kwargs)
+        loader.split = split
+        return loader
+
+    def set_epoch(self, epoch: int) -> None:
+        """
+        Новая эпоха: в стриминге перемешивание использует seed + epoch.
+        """
+        if self.streaming:
+            self.dataset.set_epoch(epoch)
 
     def __len__(self) -> int:
+        if self.streaming:
+            raise TypeError("Streaming HFImageLoader has no length")
         return len(self.dataset)
 
+    def _decode(self, value: Any) -> np.ndarray:
+        if self.decode is not None and not isinstance(value, PILImage.Image):
+            return decode_image(value, mode=self.decode, target_size=self.target_size,
+                                backend=self.decode_backend)
+        if isinstance(value, dict):
+            if value.get("bytes") is not None:
+                value = PILImage.open(io.BytesIO(value["bytes"]))
+            else:
+                value = PILImage.open(value["path"])
+            # Как datasets.Image.decode_example: учитываем EXIF Orientation
+            if value.getexif().get(ORIENTATION) is not None:
+                value = ImageOps.exif_transpose(value)
+            if self._image_mode and value.mode != self._image_mode:
+                value = value.convert(self._image_mode)
+        return np.array(value)
+
+    def sample_id(self, item: Dict[str, Any]) -> int:
+        """
+        Стабильный id примера: по image_id_column, если он задан,
+        иначе по закодированным байтам изображения. Не зависит от позиции
+        примера, шардирования, перемешивания и режима (стриминг / map-style).
+        """
+        if self.image_id_column and self.image_id_column in item:
+            return stable_id(str(item[self.image_id_column]))
+        return stable_id(item[self.image_column])
+
+    def _image_name(self, item: Dict[str, Any], idx: Optional[int], sample_id: Optional[int]) -> str:
+        if self.image_id_column and self.image_id_column in item:
+            return str(item[self.image_id_column])
+        if idx is not None:
+            return f"{self.split}_{idx:06d}.png"
+        return f"{self.split}_{sample_id:016x}.png"
+
     def get_item(self, idx: int) -> Tuple[np.ndarray, str, str]:
         """
         Получить элемент по индексу. В формате numpy array.
         Возвращает кортеж (image_np, target, image_name).
         """
+        if self.streaming:
+            raise TypeError("Random access is not supported for streaming datasets")
 
         item = self.dataset[idx]
-        image_np = np.array(item[self.image_column])
+        image_np = self._decode(item[self.image_column])
         target = item[self.target_column]
 
-        if self.image_id_column and self.image_id_column in item:
-            image_name = str(item[self.image_id_column])
-        else:
-            image_name = f"{self.split}_{idx:06d}.png"
-
-        return image_np, target, image_name
+        return image_np, target, self._image_name(item, idx, None)
 
     def __getitem__(self, idx: int) -> Tuple[np.ndarray, str, str]:
         return self.get_item(idx)
 
+    def iter_samples(self) -> Iterator[Tuple[np.ndarray, str, str, int]]:
+        """
+        Итерация с sample_id: (image_np, target, image_name, sample_id).
+
+        sample_id стоит передавать в AugmentationPipeline вместо idx —
+        выбор аугментации тогда воспроизводим при любом порядке примеров.
+        """
+        if not self.streaming:
+            for idx in range(len(self.dataset)):
+                item = self.dataset[idx]
+                sample_id = self.sample_id(item)
+                image_np = self._decode(item[self.image_column])
+                yield image_np, item[self.target_column], self._image_name(item, idx, sample_id), sample_id
+            return
+
+        for item in self.dataset:
+            sample_id = self.sample_id(item)
+            image_np = self._decode(item[self.image_column])
+            yield image_np, item[self.target_column], self._image_name(item, None, sample_id), sample_id
+
     def __iter__(self) -> Iterator[Tuple[np.ndarray, str, str]]:
-        for idx in range(len(self.dataset)):
-            yield self.get_item(idx)
+        if not self.streaming:
+            for idx in range(len(self.dataset)):
+                yield self.get_item(idx)
+            return
+
+        for image_np, target, image_name, _ in self.iter_samples():
+            yield image_np, target, image_name
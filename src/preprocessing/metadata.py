@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .configs import PipelineConfig
+
+# Значение для строк, где параметр не задан (аугментация не применялась)
+_EMPTY = {"float32": np.nan, "int32": 0, "bool": False, "str": None}
+
+
+class MetadataBuffer:
+    """
+    Буфер метаданных аугментаций в виде структуры массивов.
+
+    Вместо списка вложенных dict на каждый пример храним по колонке numpy
+    на каждое поле: индекс примера, флаг применения, код аугментации
+    и скалярные параметры по схемам аугментаций (param_schema).
+    Буфер растёт удвоением, запись одного примера — несколько присваиваний
+    в заранее выделенные массивы.
+
+    Колонки: idx, applied, name (код в names, -1 — без аугментации)
+    и "<ключ аугментации>.<параметр>".
+
+    Args:
+        config - PipelineConfig, по аугментациям которого строится схема
+        capacity - начальная ёмкость буфера (примеров)
+    """
+
+    def __init__(self, config: PipelineConfig, capacity: int = 1024):
+        self.names: List[str] = list(config.augmentations.keys())
+        self._codes = {name: i for i, name in enumerate(self.names)}
+        self._augs = dict(config.augmentations)
+
+        self.schema: Dict[str, Dict[str, str]] = {
+            name: dict(aug.param_schema) for name, aug in self._augs.items()
+        }
+
+        self._capacity = max(1, int(capacity))
+        self._size = 0
+        self._columns: Dict[str, np.ndarray] = {}
+        self._dtypes: Dict[str, str] = {"idx": "int64", "applied": "bool", "name": "int16"}
+        for name, fields in self.schema.items():
+            for field, dtype in fields.items():
+                self._dtypes[f"{name}.{field}"] = dtype
+        self._allocate()
+
+    def _allocate(self) -> None:
+        for column, dtype in self._dtypes.items():
+            self._columns[column] = self._empty(dtype, self._capacity)
+        self._columns["idx"].fill(-1)
+        self._columns["name"].fill(-1)
+
+    @staticmethod
+    def _empty(dtype: str, size: int) -> np.ndarray:
+        if dtype == "str":
+            return np.full(size, None, dtype=object)
+        return np.full(size, _EMPTY.get(dtype, 0), dtype=dtype)
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        for column, values in self._columns.items():
+            grown = self._empty(self._dtypes[column], capacity)
+            grown[:self._size] = values[:self._size]
+            if column in ("idx", "name"):
+                grown[self._size:] = -1
+            self._columns[column] = grown
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, meta: Dict[str, Any], idx: Optional[int] = None) -> None:
+        """
+        Добавить метаданные одного примера (результат AugmentationPipeline).
+
+        Параметры могут быть как полными, так и компактными (compact_params) —
+        в буфер попадают только скаляры из схемы.
+        """
+        if self._size == self._capacity:
+            self._grow(self._size + 1)
+
+        row = self._size
+        self._size += 1
+
+        if idx is not None:
+            self._columns["idx"][row] = idx
+        if not meta.get("applied"):
+            return
+
+        name = meta["name"]
+        self._columns["applied"][row] = True
+        self._columns["name"][row] = self._codes[name]
+
+        params = meta.get("params")
+        if not params:
+            return
+
+        for key, value in self._augs[name].scalar_params(params).items():
+            if value is not None:
+                self._columns[f"{name}.{key}"][row] = value
+
+    def extend(self, metas: Sequence[Dict[str, Any]], idxs: Optional[Iterable[int]] = None) -> None:
+        """
+        Добавить метаданные батча.
+        """
+        needed = self._size + len(metas)
+        if needed > self._capacity:
+            self._grow(needed)
+
+        if idxs is None:
+            for meta in metas:
+                self.append(meta)
+        else:
+            for meta, idx in zip(metas, idxs):
+                self.append(meta, idx=idx)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Накопленные данные: колонка -> массив длины len(self) (без копирования).
+        """
+        return {column: values[:self._size] for column, values in self._columns.items()}
+
+    def reset(self) -> None:
+        self._size = 0
+        self._allocate()
+
+    def to_arrow(self) -> Any:
+        """
+        pyarrow.Table: name — словарная колонка, параметры каждой
+        аугментации — struct-колонка (null в строках других аугментаций).
+        """
+        import pyarrow as pa
+
+        columns = self.columns()
+        codes = columns["name"]
+        arrays: List[Tuple[str, Any]] = [
+            ("idx", pa.array(columns["idx"])),
+            ("applied", pa.array(columns["applied"])),
+            ("name", pa.DictionaryArray.from_arrays(
+                pa.array(codes, mask=codes < 0, type=pa.int16()),
+                pa.array(self.names, type=pa.string()),
+            )),
+        ]
+
+        for code, (name, fields) in enumerate(self.schema.items()):
+            if not fields:
+                continue
+            children = [pa.array(columns[f"{name}.{field}"]) for field in fields]
+            struct = pa.StructArray.from_arrays(children, names=list(fields), mask=pa.array(codes != code))
+            arrays.append((name, struct))
+
+        return pa.table(dict(arrays))
+
+    def to_parquet(self, path: str, **kwargs: Any) -> None:
+        """
+        Записать накопленные метаданные в Parquet для аналитики.
+        """
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path, **kwargs)
@@ -0,0 +1,5 @@
+from .edit_distance import batch_levenshtein, levenshtein
+from .error_rate import ErrorCounts, ErrorRateAccumulator, calc_metrics, normalize_text
+
+__all__ = ['batch_levenshtein', 'levenshtein',
+           'ErrorCounts', 'ErrorRateAccumulator', 'calc_metrics', 'normalize_text']
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Sequence
+
+from .edit_distance import batch_levenshtein
+
+_ws_re = re.compile(r"\s+")
+
+
+def normalize_text(s: Optional[str]) -> str:
+    """
+    Минимальная нормализация: убрать лишние пробелы/переводы строк.
+    """
+    if s is None:
+        return ""
+    s = s.replace("\u00A0", " ")  # non-breaking space
+    return _ws_re.sub(" ", s).strip()
+
+
+@dataclass
+class ErrorCounts:
+    """
+    Накопленные ошибки на уровне корпуса.
+    """
+
+    char_errors: int = 0
+    chars: int = 0
+    word_errors: int = 0
+    words: int = 0
+    samples: int = 0
+
+    def merge(self, other: "ErrorCounts") -> None:
+        self.char_errors += other.char_errors
+        self.chars += other.chars
+        self.word_errors += other.word_errors
+        self.words += other.words
+        self.samples += other.samples
+
+    @property
+    def cer(self) -> float:
+        return self.char_errors / self.chars if self.chars else 0.0
+
+    @property
+    def wer(self) -> float:
+        return self.word_errors / self.words if self.words else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "CER": self.cer,
+            "WER": self.wer,
+            "samples": self.samples,
+            "chars": self.chars,
+            "words": self.words,
+        }
+
+
+@dataclass
+class ErrorRateAccumulator:
+    """
+    Потоковый подсчёт CER/WER на уровне корпуса (как evaluate/jiwer:
+    сумма расстояний, делённая на суммарную длину эталонов).
+
+    Args:
+        normalize - функция нормализации текста перед подсчётом
+        num_workers - число процессов для подсчёта расстояний в батче
+    """
+
+    normalize: Callable[[Optional[str]], str] = normalize_text
+    num_workers: Optional[int] = None
+    total: ErrorCounts = field(default_factory=ErrorCounts)
+    groups: Dict[str, ErrorCounts] = field(default_factory=dict)
+
+    def update(
+        self,
+        refs: Sequence[Optional[str]],
+        hyps: Sequence[Optional[str]],
+        groups: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Добавить батч пар (эталон, предсказание).
+
+        Args:
+            refs - эталонные тексты
+            hyps - предсказанные тексты
+            groups - метки групп (например, колонка dataset) для разбивки
+        """
+        if len(refs) != len(hyps):
+            raise ValueError("refs and hyps must have the same length")
+        if groups is not None and len(groups) != len(refs):
+            raise ValueError("groups must have the same length as refs")
+
+        refs_n = [self.normalize(r) for r in refs]
+        hyps_n = [self.normalize(h) for h in hyps]
+        refs_w = [r.split() for r in refs_n]
+        hyps_w = [h.split() for h in hyps_n]
+
+        char_d = batch_levenshtein(refs_n, hyps_n, num_workers=self.num_workers)
+        word_d = batch_levenshtein(refs_w, hyps_w, num_workers=self.num_workers)
+
+        for i in range(len(refs_n)):
+            counts = ErrorCounts(
+                char_errors=char_d[i],
+                chars=len(refs_n[i]),
+                word_errors=word_d[i],
+                words=len(refs_w[i]),
+                samples=1,
+            )
+            self.total.merge(counts)
+            if groups is not None:
+                self.groups.setdefault(str(groups[i]), ErrorCounts()).merge(counts)
+
+    def merge(self, other: "ErrorRateAccumulator") -> None:
+        """
+        Объединить с аккумулятором, посчитанным на другой части данных.
+        """
+        self.total.merge(other.total)
+        for name, counts in other.groups.items():
+            self.groups.setdefault(name, ErrorCounts()).merge(counts)
+
+    def compute(self) -> Dict[str, float]:
+        """
+        Итоговые метрики по всему корпусу.
+        """
+        return self.total.to_dict()
+
+    def compute_groups(self) -> Dict[str, Dict[str, float]]:
+        """
+        Метрики в разбивке по группам.
+        """
+        return {name: counts.to_dict() for name, counts in sorted(self.groups.items())}
+
+    def reset(self) -> None:
+        self.total = ErrorCounts()
+        self.groups = {}
+
+
+def calc_metrics(
+    refs: Sequence[Optional[str]],
+    hyps: Sequence[Optional[str]],
+    num_workers: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    CER и WER на уровне корпуса для списков текстов.
+    """
+    acc = ErrorRateAccumulator(num_workers=num_workers)
+    acc.update(refs, hyps)
+    return acc.compute()
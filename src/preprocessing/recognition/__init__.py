@@ -0,0 +1,8 @@
+from .engine import RecognitionEngine
+from .registry import clear_registry, load_model, loaded_models
+from .tta import (AGGREGATIONS, TestTimeAugmentation, TTAResult,
+                  aggregate_predictions, tta_error_rates)
+
+__all__ = ['RecognitionEngine', 'clear_registry', 'load_model', 'loaded_models',
+           'AGGREGATIONS', 'TestTimeAugmentation', 'TTAResult',
+           'aggregate_predictions', 'tta_error_rates']
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from PIL import Image
+from transformers import LogitsProcessor, LogitsProcessorList
+
+from ..segmentation import LineSegmenter
+from ..utils.image import to_numpy, to_rgb
+from .registry import load_model
+from .tta import TestTimeAugmentation, TTAResult, aggregate_predictions
+
+
+class _TokenLogProbs(LogitsProcessor):
+    """
+    Запоминает log-prob выбранного токена на каждом шаге жадной генерации
+    (максимум log_softmax) — без хранения полных scores (B, vocab) по шагам.
+    """
+
+    def __init__(self):
+        self.steps: List[torch.Tensor] = []
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        self.steps.append(scores.float().log_softmax(dim=-1).max(dim=-1).values)
+        return scores
+
+
+class RecognitionEngine:
+    """
+    Постраничное распознавание текста моделью TrOCR.
+
+    Модель загружается один раз (через реестр моделей), страницы
+    принимаются потоком, а строки из нескольких страниц упаковываются
+    в батчи фиксированного размера. Внутри окна строки сортируются по
+    соотношению сторон (ожидаемой длине текста), чтобы в одном батче
+    generate завершался примерно одновременно, затем результаты
+    собираются обратно по страницам в исходном порядке.
+
+    Args:
+        model_id - имя модели на HF Hub или локальный путь
+        device - устройство (по умолчанию cpu)
+        revision - ревизия модели на HF Hub (опционально)
+        num_threads - число intra-op потоков torch (None — не менять)
+        batch_size - размер батча строк для generate
+        max_new_tokens - ограничение длины генерации на строку
+        num_beams - число лучей при генерации
+        segmenter - сегментатор строк (по умолчанию LineSegmenter())
+        window_lines - сколько строк накапливать перед запуском модели
+            (по умолчанию 8 батчей)
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        device: str = "cpu",
+        revision: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        batch_size: int = 32,
+        max_new_tokens: int = 64,
+        num_beams: int = 1,
+        segmenter: Optional[LineSegmenter] = None,
+        window_lines: Optional[int] = None,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+
+        self.model_id = model_id
+        self.device = device
+        self.revision = revision
+        self.batch_size = batch_size
+        self.max_new_tokens = max_new_tokens
+        self.num_beams = num_beams
+        self.segmenter = segmenter or LineSegmenter()
+        self.window_lines = window_lines or batch_size * 8
+
+        self.processor, self.model = load_model(model_id, device=device, revision=revision)
+        self.fp16 = self.model.dtype == torch.float16
+
+    def _generate(self, images: Sequence[np.ndarray]) -> List[str]:
+        return self._generate_scored(images, scores=False)[0]
+
+    def _generate_scored(
+        self,
+        images: Sequence[np.ndarray],
+        scores: bool = True,
+    ) -> Tuple[List[str], Optional[np.ndarray]]:
+        pixel_values = self.processor(
+            images=[to_rgb(image) for image in images],
+            return_tensors="pt",
+        ).pixel_values.to(self.device)
+        if self.fp16:
+            pixel_values = pixel_values.half()
+
+        options = {}
+        token_logprobs = None
+        if scores and self.num_beams > 1:
+            options = {"output_scores": True, "return_dict_in_generate": True}
+        elif scores:
+            token_logprobs = _TokenLogProbs()
+            options = {"logits_processor": LogitsProcessorList([token_logprobs])}
+
+        generated = self.model.generate(
+            pixel_values,
+            num_beams=self.num_beams,
+            max_new_tokens=self.max_new_tokens,
+            do_sample=False,
+            **options,
+        )
+
+        confidence = None
+        if scores and self.num_beams > 1:
+            # sequences_scores — log-prob луча, нормированный на длину
+            confidence = generated.sequences_scores.float().cpu().numpy()
+            generated = generated.sequences
+        elif scores:
+            confidence = self._mean_logprob(generated, token_logprobs.steps)
+
+        preds = self.processor.batch_decode(generated, skip_special_tokens=True)
+        return [p.strip() for p in preds], confidence
+
+    def _mean_logprob(self, sequences: torch.Tensor, steps: List[torch.Tensor]) -> np.ndarray:
+        if not steps:
+            return np.zeros(sequences.shape[0], dtype=np.float32)
+
+        logprobs = torch.stack(steps, dim=1)
+        tokens = sequences[:, -logprobs.shape[1]:]
+        # Токены после конца строки (паддинг) в уверенность не входят
+        pad_id = self.model.generation_config.pad_token_id
+        mask = torch.ones_like(tokens, dtype=torch.bool) if pad_id is None else tokens != pad_id
+        total = (logprobs * mask).sum(dim=1)
+        return (total / mask.sum(dim=1).clamp(min=1)).cpu().numpy()
+
+    def _recognize(
+        self,
+        arrays: Sequence[np.ndarray],
+        scores: bool = False,
+    ) -> Tuple[List[str], np.ndarray]:
+        aspect = np.array(
+            [a.shape[1] / max(a.shape[0], 1) for a in arrays], dtype=np.float32
+        )
+        order = np.argsort(-aspect, kind="stable")
+
+        texts: List[str] = [""] * len(arrays)
+        confidence = np.zeros(len(arrays), dtype=np.float32)
+        with torch.inference_mode():
+            for i in range(0, len(order), self.batch_size):
+                chunk = order[i:i + self.batch_size]
+                preds, chunk_scores = self._generate_scored([arrays[j] for j in chunk], scores=scores)
+                for j, pred in zip(chunk, preds):
+                    texts[j] = pred
+                if chunk_scores is not None:
+                    confidence[chunk] = chunk_scores
+
+        return texts, confidence
+
+    def recognize_lines(
+        self,
+        lines: Sequence[Image.Image | np.ndarray],
+    ) -> List[str]:
+        """
+        Распознать набор строк батчами, отсортированными по ширине.
+
+        Args:
+            lines - Изображения строк
+        Returns:
+            texts - Тексты строк в исходном порядке
+        """
+        if len(lines) == 0:
+            return []
+
+        return self._recognize([to_numpy(line) for line in lines])[0]
+
+    def recognize_lines_tta(
+        self,
+        lines: Sequence[Image.Image | np.ndarray],
+        tta: TestTimeAugmentation,
+        aggregate: str = "vote",
+    ) -> List[TTAResult]:
+        """
+        Распознать строки с test-time augmentation.
+
+        Варианты всех строк упаковываются в общие батчи generate (с той же
+        сортировкой по ширине, что и recognize_lines), а не распознаются
+        отдельным вызовом на каждый вариант.
+
+        Args:
+            lines - Изображения строк
+            tta - генератор вариантов
+            aggregate - vote или confidence (см. aggregate_predictions)
+        Returns:
+            results - TTAResult по строкам в исходном порядке
+        """
+        if len(lines) == 0:
+            return []
+
+        arrays: List[np.ndarray] = []
+        metas: List[List[dict]] = []
+        for line in lines:
+            variants, variant_metas = tta.variants(line)
+            arrays.extend(variants)
+            metas.append(variant_metas)
+
+        texts, confidence = self._recognize(arrays, scores=True)
+
+        results: List[TTAResult] = []
+        pos = 0
+        for line_metas in metas:
+            n = len(line_metas)
+            variant_texts = texts[pos:pos + n]
+            variant_scores = [float(c) for c in confidence[pos:pos + n]]
+            results.append(TTAResult(
+                text=aggregate_predictions(variant_texts, variant_scores, method=aggregate),
+                variants=variant_texts,
+                scores=variant_scores,
+                metas=line_metas,
+            ))
+            pos += n
+
+        return results
+
+    def _flush(
+        self,
+        lines: List[np.ndarray],
+        counts: List[int],
+    ) -> Iterator[str]:
+        texts = self.recognize_lines(lines)
+        pos = 0
+        for cnt in counts:
+            yield " ".join(t for t in texts[pos:pos + cnt] if t)
+            pos += cnt
+
+    def recognize_pages(
+        self,
+        pages: Iterable[Image.Image | np.ndarray],
+    ) -> Iterator[str]:
+        """
+        Распознать поток страниц.
+
+        Args:
+            pages - Итерируемый набор страниц
+        Yields:
+            text - Текст каждой страницы в порядке поступления
+        """
+        lines: List[np.ndarray] = []
+        counts: List[int] = []
+
+        for page in pages:
+            page_lines = self.segmenter.split(page)
+            lines.extend(page_lines)
+            counts.append(len(page_lines))
+
+            if len(lines) >= self.window_lines:
+                yield from self._flush(lines, counts)
+                lines, counts = [], []
+
+        if counts:
+            yield from self._flush(lines, counts)
+
+    def recognize_page(self, page: Image.Image | np.ndarray) -> str:
+        """
+        Распознать одну страницу.
+        """
+        return next(self.recognize_pages([page]))
+
+    def __call__(self, pages: Iterable[Image.Image | np.ndarray]) -> List[str]:
+        return list(self.recognize_pages(pages))
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from transformers import TrOCRProcessor, VisionEncoderDecoderModel
+
+ModelKey = Tuple[str, Optional[str], str, bool]
+
+# (model_id, revision, device, fp16) -> (processor, model)
+_MODELS: Dict[ModelKey, Tuple[Any, Any]] = {}
+_LOCK = Lock()
+
+
+def load_model(
+    model_id: str,
+    device: str = "cpu",
+    revision: Optional[str] = None,
+    fp16: Optional[bool] = None,
+) -> Tuple[TrOCRProcessor, VisionEncoderDecoderModel]:
+    """
+    Загрузить процессор и модель TrOCR один раз на процесс.
+
+    Повторные вызовы с теми же аргументами возвращают уже загруженные
+    объекты из реестра, без повторного from_pretrained.
+
+    Args:
+        model_id - имя модели на HF Hub или локальный путь
+        device - устройство (cpu / cuda)
+        revision - ревизия модели на HF Hub (опционально)
+        fp16 - переводить ли модель в half (по умолчанию — только на cuda)
+    Returns:
+        processor, model
+    """
+    if fp16 is None:
+        fp16 = device.startswith("cuda")
+
+    key = (model_id, revision, device, fp16)
+    with _LOCK:
+        if key not in _MODELS:
+            processor = TrOCRProcessor.from_pretrained(
+                model_id, revision=revision, use_fast=True
+            )
+            model = VisionEncoderDecoderModel.from_pretrained(
+                model_id, revision=revision
+            )
+            model = model.to(device).eval()
+            if fp16:
+                model = model.half()
+            _MODELS[key] = (processor, model)
+
+        return _MODELS[key]
+
+
+def loaded_models() -> List[ModelKey]:
+    """
+    Список ключей (model_id, revision, device, fp16) загруженных моделей.
+    """
+    with _LOCK:
+        return list(_MODELS.keys())
+
+
+def clear_registry() -> None:
+    """
+    Выгрузить все модели из реестра.
+    """
+    with _LOCK:
+        _MODELS.clear()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from PIL import Image
+
+from ..augmentation_pipeline import AugmentationPipeline
+from ..metrics import ErrorRateAccumulator, normalize_text
+from ..transforms.torch_backend import TorchBatchAugmenter, augment_batch
+from ..utils.hashing import stable_id
+from ..utils.image import to_numpy, to_uint8
+
+AGGREGATIONS = ("vote", "confidence")
+
+
+@dataclass
+class TTAResult:
+    """
+    Результат TTA для одной строки.
+
+    Args:
+        text - итоговое предсказание
+        variants - предсказания по вариантам (в порядке вариантов)
+        scores - средний log-prob токенов по вариантам (уверенность модели)
+        metas - метаданные аугментаций вариантов
+    """
+
+    text: str
+    variants: List[str]
+    scores: List[float]
+    metas: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class TestTimeAugmentation:
+    """
+    Детерминированные TTA-варианты изображений строк.
+
+    Все варианты одного изображения получаются одним вызовом
+    augment_batch: изображение размножается в батч (N, C, H, W), выбор
+    аугментации и её параметры у каждого варианта свои. Варианты
+    зависят только от seed и содержимого изображения (stable_id), поэтому
+    повторный прогон на тех же данных даёт те же варианты.
+
+    Каждый вариант, кроме исходного, аугментируется всегда: p_aug
+    пайплайна игнорируется (иначе часть вариантов повторяла бы исходное
+    изображение), используются только веса аугментаций.
+
+    Args:
+        pipeline - AugmentationPipeline
+        num_variants - число вариантов на изображение (вместе с исходным)
+        include_original - нулевой вариант — исходное изображение
+        seed - seed вариантов
+        fill - значение фона для TorchBatchAugmenter
+        elastic_grid - шаг сетки elastic для TorchBatchAugmenter
+    """
+
+    def __init__(
+        self,
+        pipeline: AugmentationPipeline,
+        num_variants: int = 4,
+        include_original: bool = True,
+        seed: int = 0,
+        fill: float = 255.0,
+        elastic_grid: int = 8,
+    ):
+        if num_variants < 1:
+            raise ValueError("num_variants must be >= 1")
+
+        self.pipeline = pipeline
+        self.num_variants = num_variants
+        self.include_original = include_original
+        self.seed = seed
+        self.fill = fill
+        self.elastic_grid = elastic_grid
+
+    def variants(
+        self,
+        image: Image.Image | np.ndarray,
+    ) -> Tuple[List[np.ndarray], List[Dict[str, Any]]]:
+        """
+        Варианты одного изображения.
+
+        Args:
+            image - изображение строки (gray или RGB)
+        Returns:
+            images - num_variants изображений того же размера
+            metas - метаданные аугментаций по вариантам
+        """
+        array = to_uint8(to_numpy(image))
+        key = stable_id(array) ^ self.seed
+
+        images: List[np.ndarray] = []
+        metas: List[Dict[str, Any]] = []
+        if self.include_original:
+            images.append(array)
+            metas.append({"applied": False})
+
+        count = self.num_variants - len(images)
+        if count == 0:
+            return images, metas
+
+        channels = array if array.ndim == 3 else array[:, :, None]
+        batch = torch.from_numpy(np.ascontiguousarray(channels.transpose(2, 0, 1)))
+        batch = batch[None].repeat(count, 1, 1, 1)
+        idxs = [key * self.num_variants + v for v in range(count)]
+
+        # Параметры аугментаций семплируются из глобальных random / np.random:
+        # фиксируем их на время вызова, чтобы варианты были воспроизводимы
+        py_state, np_state = random.getstate(), np.random.get_state()
+        random.seed(key)
+        np.random.seed(key % 2**32)
+        try:
+            augmenter = TorchBatchAugmenter(
+                fill=self.fill,
+                generator=torch.Generator().manual_seed(key),
+                elastic_grid=self.elastic_grid,
+            )
+            out, aug_metas = augment_batch(self.pipeline, batch, idxs=idxs,
+                                       augmenter=augmenter, force=True)
+        finally:
+            random.setstate(py_state)
+            np.random.set_state(np_state)
+
+        out = out.permute(0, 2, 3, 1).numpy()
+        for i in range(count):
+            images.append(out[i, :, :, 0] if array.ndim == 2 else out[i])
+        metas.extend(aug_metas)
+        return images, metas
+
+
+def aggregate_predictions(
+    texts: Sequence[str],
+    scores: Sequence[float],
+    method: str = "vote",
+) -> str:
+    """
+    Итоговое предсказание по вариантам.
+
+    vote — самый частый текст (тексты сравниваются после normalize_text),
+    при равенстве — с большей суммарной уверенностью; confidence — вариант
+    с наибольшим средним log-prob токенов. В обоих случаях возвращается
+    исходный текст варианта (для vote — самого уверенного в группе).
+
+    Args:
+        texts - предсказания вариантов
+        scores - уверенность вариантов
+        method - vote или confidence
+    """
+    if method not in AGGREGATIONS:
+        raise ValueError(f"method must be one of {AGGREGATIONS}")
+    if not texts:
+        return ""
+
+    if method == "confidence":
+        return texts[int(np.argmax(scores))]
+
+    normalized = [normalize_text(t) for t in texts]
+    votes = Counter(normalized)
+    confidence: Dict[str, float] = {}
+    for text, score in zip(normalized, scores):
+        confidence[text] = confidence.get(text, 0.0) + float(score)
+
+    winner = max(votes, key=lambda text: (votes[text], confidence[text]))
+    members = [i for i, text in enumerate(normalized) if text == winner]
+    return texts[max(members, key=lambda i: float(scores[i]))]
+
+
+def tta_error_rates(
+    results: Sequence[TTAResult],
+    refs: Sequence[Optional[str]],
+    num_workers: Optional[int] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    CER/WER итогового предсказания и каждого варианта отдельно.
+
+    Args:
+        results - результаты recognize_lines_tta
+        refs - эталонные тексты строк
+        num_workers - процессы для подсчёта расстояний
+    Returns:
+        dict - tta (итог) и variant_<i> -> метрики ErrorRateAccumulator
+    """
+    if len(results) != len(refs):
+        raise ValueError("results and refs must have the same length")
+
+    acc = ErrorRateAccumulator(num_workers=num_workers)
+    acc.update(refs, [r.text for r in results], groups=["tta"] * len(results))
+
+    variant_refs: List[Optional[str]] = []
+    variant_hyps: List[str] = []
+    variant_groups: List[str] = []
+    for result, ref in zip(results, refs):
+        for i, text in enumerate(result.variants):
+            variant_refs.append(ref)
+            variant_hyps.append(text)
+            variant_groups.append(f"variant_{i}")
+
+    if variant_hyps:
+        variants = ErrorRateAccumulator(num_workers=num_workers)
+        variants.update(variant_refs, variant_hyps, groups=variant_groups)
+        acc.groups.update(variants.groups)
+
+    return acc.compute_groups()
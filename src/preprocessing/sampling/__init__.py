@@ -0,0 +1,5 @@
+from .bucket_sampler import BucketBatchSampler, padding_stats
+from .size_index import SizeIndex, build_size_index, read_image_size
+
+__all__ = ['BucketBatchSampler', 'padding_stats',
+           'SizeIndex', 'build_size_index', 'read_image_size']
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .size_index import SizeIndex
+
+
+class BucketBatchSampler:
+    """
+    Батч-сэмплер, группирующий примеры близкой длины разметки и формы.
+
+    Индексы перемешиваются, делятся на окна по bucket_size_multiplier
+    батчей, внутри окна сортируются по длине разметки (затем по
+    соотношению сторон изображения) и режутся на батчи. Порядок
+    батчей тоже перемешивается. Всё случайное зависит только от
+    seed и номера эпохи, поэтому порядок воспроизводим.
+
+    Совместим с torch.utils.data.DataLoader(batch_sampler=...).
+
+    Args:
+        index - SizeIndex датасета
+        batch_size - размер батча
+        bucket_size_multiplier - размер окна сортировки в батчах
+            (больше — меньше паддинга, но меньше случайности)
+        shuffle - перемешивать ли данные
+        seed - seed перемешивания
+        drop_last - отбрасывать ли неполный последний батч окна
+        indices - подмножество индексов датасета (опционально)
+    """
+
+    def __init__(
+        self,
+        index: SizeIndex,
+        batch_size: int,
+        bucket_size_multiplier: int = 50,
+        shuffle: bool = True,
+        seed: int = 42,
+        drop_last: bool = False,
+        indices: Optional[Sequence[int]] = None,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if bucket_size_multiplier < 1:
+            raise ValueError("bucket_size_multiplier must be >= 1")
+
+        self.index = index
+        self.batch_size = batch_size
+        self.bucket_size_multiplier = bucket_size_multiplier
+        self.shuffle = shuffle
+        self.seed = seed
+        self.drop_last = drop_last
+        self.epoch = 0
+
+        if indices is None:
+            self.indices = np.arange(len(index), dtype=np.int64)
+        else:
+            self.indices = np.asarray(indices, dtype=np.int64)
+
+        self._lengths = np.asarray(index.lengths)
+        self._aspect = np.asarray(index.aspect_ratios)
+
+    def set_epoch(self, epoch: int) -> None:
+        """
+        Задать номер эпохи (меняет перемешивание между эпохами).
+        """
+        self.epoch = epoch
+
+    def _batches(self) -> List[np.ndarray]:
+        rng = np.random.default_rng([self.seed, self.epoch])
+
+        indices = self.indices
+        if self.shuffle:
+            indices = rng.permutation(indices)
+
+        window = self.batch_size * self.bucket_size_multiplier
+        batches: List[np.ndarray] = []
+        for start in range(0, len(indices), window):
+            chunk = indices[start:start + window]
+            # lexsort: последний ключ — основной
+            order = np.lexsort((self._aspect[chunk], self._lengths[chunk]))
+            chunk = chunk[order]
+
+            for b in range(0, len(chunk), self.batch_size):
+                batch = chunk[b:b + self.batch_size]
+                if self.drop_last and len(batch) < self.batch_size:
+                    continue
+                batches.append(batch)
+
+        if self.shuffle:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+
+        return batches
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for batch in self._batches():
+            yield batch.tolist()
+
+    def __len__(self) -> int:
+        n = len(self.indices)
+        window = self.batch_size * self.bucket_size_multiplier
+        full, rest = divmod(n, window)
+        per_window = self.bucket_size_multiplier
+        if self.drop_last:
+            return full * per_window + rest // self.batch_size
+        return full * per_window + -(-rest // self.batch_size)
+
+
+def padding_stats(
+    lengths: np.ndarray,
+    batches: Sequence[Sequence[int]],
+) -> Dict[str, float]:
+    """
+    Оценить долю паддинга при заданном разбиении на батчи.
+
+    Args:
+        lengths - длины разметки (например, SizeIndex.lengths)
+        batches - список батчей индексов
+    Returns:
+        dict - полезные токены, токены с паддингом и доля паддинга
+    """
+    lengths = np.asarray(lengths)
+    useful = 0
+    padded = 0
+    for batch in batches:
+        batch_lengths = lengths[np.asarray(batch, dtype=np.int64)]
+        useful += int(batch_lengths.sum())
+        padded += int(batch_lengths.max()) * len(batch_lengths)
+
+    return {
+        "useful_tokens": float(useful),
+        "padded_tokens": float(padded),
+        "padding_ratio": (1.0 - useful / padded) if padded else 0.0,
+    }
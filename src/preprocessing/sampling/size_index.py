@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from datasets import Dataset
+from datasets import Image as ImageFeature
+from PIL import Image
+
+
+def read_image_size(value: Any) -> Tuple[int, int]:
+    """
+    Прочитать размер изображения без полного декодирования.
+
+    PIL.Image.open читает только заголовок файла, пиксели не декодируются.
+
+    Args:
+        value - закодированное изображение: dict {"bytes", "path"}
+            (datasets.Image(decode=False)), bytes, путь или PIL.Image
+    Returns:
+        (width, height)
+    """
+    if isinstance(value, Image.Image):
+        return value.size
+    if isinstance(value, np.ndarray):
+        return value.shape[1], value.shape[0]
+
+    if isinstance(value, dict):
+        if value.get("bytes") is not None:
+            value = value["bytes"]
+        else:
+            value = value["path"]
+
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = io.BytesIO(value)
+
+    with Image.open(value) as img:
+        return img.size
+
+
+@dataclass
+class SizeIndex:
+    """
+    Индекс размеров изображений и длин разметки датасета.
+
+    Args:
+        widths - ширины изображений
+        heights - высоты изображений
+        text_lengths - длины текстов в символах
+        label_lengths - длины разметки в токенах (если был задан токенизатор)
+    """
+
+    widths: np.ndarray
+    heights: np.ndarray
+    text_lengths: np.ndarray
+    label_lengths: Optional[np.ndarray] = None
+
+    def __post_init__(self) -> None:
+        n = len(self.widths)
+        arrays = [self.heights, self.text_lengths]
+        if self.label_lengths is not None:
+            arrays.append(self.label_lengths)
+        if any(len(a) != n for a in arrays):
+            raise ValueError("All SizeIndex arrays must have the same length")
+
+    def __len__(self) -> int:
+        return len(self.widths)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """
+        Длины разметки: в токенах, если есть, иначе в символах.
+        """
+        if self.label_lengths is not None:
+            return self.label_lengths
+        return self.text_lengths
+
+    @property
+    def aspect_ratios(self) -> np.ndarray:
+        return self.widths / np.maximum(self.heights, 1)
+
+    def save(self, path: str) -> None:
+        """
+        Сохранить индекс в sidecar-файл (.npz).
+        """
+        arrays: Dict[str, np.ndarray] = {
+            "widths": self.widths,
+            "heights": self.heights,
+            "text_lengths": self.text_lengths,
+        }
+        if self.label_lengths is not None:
+            arrays["label_lengths"] = self.label_lengths
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "SizeIndex":
+        """
+        Загрузить индекс из sidecar-файла.
+        """
+        with np.load(path) as data:
+            return cls(
+                widths=data["widths"],
+                heights=data["heights"],
+                text_lengths=data["text_lengths"],
+                label_lengths=data["label_lengths"] if "label_lengths" in data else None,
+            )
+
+
+def build_size_index(
+    dataset: Dataset,
+    image_column: str = "image",
+    text_column: str = "text",
+    tokenize: Optional[Callable[[List[str]], List[List[int]]]] = None,
+    batch_size: int = 1000,
+) -> SizeIndex:
+    """
+    Построить SizeIndex по HF Dataset.
+
+    Колонка с изображением читается как закодированные байты
+    (datasets.Image(decode=False)), размеры берутся из заголовков.
+
+    Args:
+        dataset - HuggingFace Dataset
+        image_column - колонка с изображением
+        text_column - колонка с текстом
+        tokenize - функция texts -> input_ids для подсчёта длины в токенах
+            (например, lambda t: processor.tokenizer(t)["input_ids"])
+        batch_size - размер батча при чтении датасета
+    Returns:
+        SizeIndex
+    """
+    dataset = dataset.select_columns([image_column, text_column])
+    if isinstance(dataset.features[image_column], ImageFeature):
+        dataset = dataset.cast_column(image_column, ImageFeature(decode=False))
+
+    widths: List[int] = []
+    heights: List[int] = []
+    text_lengths: List[int] = []
+    label_lengths: List[int] = []
+
+    for batch in dataset.iter(batch_size=batch_size):
+        for value in batch[image_column]:
+            w, h = read_image_size(value)
+            widths.append(w)
+            heights.append(h)
+
+        texts = [t if t is not None else "" for t in batch[text_column]]
+        text_lengths.extend(len(t) for t in texts)
+        if tokenize is not None:
+            label_lengths.extend(len(ids) for ids in tokenize(texts))
+
+    return SizeIndex(
+        widths=np.asarray(widths, dtype=np.int32),
+        heights=np.asarray(heights, dtype=np.int32),
+        text_lengths=np.asarray(text_lengths, dtype=np.int32),
+        label_lengths=np.asarray(label_lengths, dtype=np.int32) if tokenize else None,
+    )
@@ -0,0 +1,5 @@
+from .ink import InkCropper, crop_box, crop_to_ink
+from .lines import LineSegmenter, find_runs, split_lines_projection
+
+__all__ = ['InkCropper', 'crop_box', 'crop_to_ink',
+           'LineSegmenter', 'find_runs', 'split_lines_projection']
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from ..utils.image import downscale, otsu_ink, to_gray, to_numpy, to_rgb
+
+Box = Tuple[int, int, int, int]
+
+CHANNEL_MODES = (None, "gray", "rgb")
+
+
+def _ink_rect(
+    strip: np.ndarray,
+    threshold: float,
+    kernel: Optional[np.ndarray],
+) -> Optional[Tuple[int, int, int, int]]:
+    """
+    bbox чернил (x, y, w, h) внутри полосы по заданному порогу.
+    """
+    if strip.size == 0:
+        return None
+
+    mask = cv2.threshold(strip, threshold, 255, cv2.THRESH_BINARY_INV)[1]
+    if kernel is not None:
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=1)
+
+    points = cv2.findNonZero(mask)
+    if points is None:
+        return None
+    return cv2.boundingRect(points)
+
+
+def crop_box(image: Image.Image | np.ndarray, box: Box) -> np.ndarray:
+    """
+    Вырезать bbox (x0, y0, x1, y1) из изображения (view, без копирования).
+    """
+    x0, y0, x1, y1 = box
+    return to_numpy(image)[y0:y1, x0:x1]
+
+
+class InkCropper:
+    """
+    Обрезка изображения по чернилам и нормализация каналов.
+
+    bbox чернил ищется на уменьшенной копии (Otsu + findNonZero/boundingRect),
+    а затем уточняется в полном разрешении (с морфологическим открытием)
+    только в узких полосах вдоль краёв грубого bbox.
+
+    Args:
+        pad - отступ вокруг найденного bbox
+        min_area - минимальная площадь bbox чернил, иначе изображение
+            не обрезается
+        max_side - ограничение большей стороны копии для поиска bbox
+            (None — искать в полном разрешении)
+        open_ksize - размер ядра морфологического открытия (0 — отключить)
+        channels - приведение каналов результата:
+            None — оставить как есть, "gray" — (H, W), "rgb" — (H, W, 3)
+        max_workers - число потоков для обработки батча
+        box_column - имя колонки с bbox при работе с HF datasets
+    """
+
+    def __init__(
+        self,
+        pad: int = 20,
+        min_area: int = 2000,
+        max_side: Optional[int] = 512,
+        open_ksize: int = 3,
+        channels: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        box_column: str = "crop_box",
+    ):
+        if channels not in CHANNEL_MODES:
+            raise ValueError(f"channels must be one of {CHANNEL_MODES}")
+
+        self.pad = pad
+        self.min_area = min_area
+        self.max_side = max_side
+        self.open_ksize = open_ksize
+        self.channels = channels
+        self.max_workers = max_workers
+        self.box_column = box_column
+
+        self._kernel = (
+            cv2.getStructuringElement(cv2.MORPH_RECT, (open_ksize, open_ksize))
+            if open_ksize
+            else None
+        )
+
+    def find_box(self, image: Image.Image | np.ndarray) -> Box:
+        """
+        Найти bbox чернил.
+
+        Args:
+            image - Изображение в формате PIL.Image или numpy.ndarray
+        Returns:
+            box - bbox (x0, y0, x1, y1); если чернил нет или их площадь
+                меньше min_area — bbox всего изображения
+        """
+        gray = to_gray(image)
+        h, w = gray.shape
+        full = (0, 0, w, h)
+
+        # 1) грубый bbox на уменьшенной копии
+        small, scale = downscale(gray, self.max_side)
+        threshold, mask = otsu_ink(small)
+        # На уменьшенной копии одиночный шум уже усреднён INTER_AREA,
+        # а открытие стёрло бы тонкие штрихи — применяем его только
+        # в полном разрешении
+        if self._kernel is not None and scale == 1.0:
+            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._kernel, iterations=1)
+
+        points = cv2.findNonZero(mask)
+        if points is None:
+            return full
+
+        x, y, bw, bh = cv2.boundingRect(points)
+        x0 = int(math.floor(x / scale))
+        y0 = int(math.floor(y / scale))
+        x1 = min(w, int(math.ceil((x + bw) / scale)))
+        y1 = min(h, int(math.ceil((y + bh) / scale)))
+
+        # 2) уточнение в полном разрешении только около краёв
+        if scale < 1.0:
+            x0, y0, x1, y1 = self._refine(gray, (x0, y0, x1, y1), threshold, scale)
+
+        if (x1 - x0) * (y1 - y0) < self.min_area:
+            return full
+
+        return (
+            max(0, x0 - self.pad),
+            max(0, y0 - self.pad),
+            min(w, x1 + self.pad),
+            min(h, y1 + self.pad),
+        )
+
+    def _refine(
+        self,
+        gray: np.ndarray,
+        box: Box,
+        threshold: float,
+        scale: float,
+    ) -> Box:
+        h, w = gray.shape
+        x0, y0, x1, y1 = box
+
+        # Полуширина полосы: один пиксель уменьшенной копии + ядро открытия
+        m = int(math.ceil(1.0 / scale)) + max(self.open_ksize, 1)
+        ox0, oy0 = max(0, x0 - m), max(0, y0 - m)
+        ox1, oy1 = min(w, x1 + m), min(h, y1 + m)
+
+        left = _ink_rect(gray[oy0:oy1, ox0:min(x0 + m, ox1)], threshold, self._kernel)
+        if left is not None:
+            x0 = ox0 + left[0]
+
+        right_start = max(x1 - m, ox0)
+        right = _ink_rect(gray[oy0:oy1, right_start:ox1], threshold, self._kernel)
+        if right is not None:
+            x1 = right_start + right[0] + right[2]
+
+        top = _ink_rect(gray[oy0:min(y0 + m, oy1), ox0:ox1], threshold, self._kernel)
+        if top is not None:
+            y0 = oy0 + top[1]
+
+        bottom_start = max(y1 - m, oy0)
+        bottom = _ink_rect(gray[bottom_start:oy1, ox0:ox1], threshold, self._kernel)
+        if bottom is not None:
+            y1 = bottom_start + bottom[1] + bottom[3]
+
+        return x0, y0, x1, y1
+
+    def normalize(self, image: Image.Image | np.ndarray) -> np.ndarray:
+        """
+        Привести каналы изображения к режиму channels.
+        """
+        if self.channels == "gray":
+            return to_gray(image)
+        if self.channels == "rgb":
+            return to_rgb(image)
+        return to_numpy(image)
+
+    def apply(
+        self,
+        image: Image.Image | np.ndarray,
+        box: Box,
+    ) -> np.ndarray:
+        """
+        Обрезать изображение по сохранённому bbox и нормализовать каналы.
+        Обрезка выполняется до конвертации, чтобы не конвертировать поля.
+        """
+        return self.normalize(crop_box(image, box))
+
+    def __call__(
+        self,
+        image: Image.Image | np.ndarray,
+    ) -> Tuple[np.ndarray, Box]:
+        """
+        Обрезать изображение по чернилам.
+
+        Args:
+            image - Изображение в формате PIL.Image или numpy.ndarray
+        Returns:
+            image - Обрезанное и нормализованное изображение
+            box - Использованный bbox (x0, y0, x1, y1)
+        """
+        image = to_numpy(image)
+        box = self.find_box(image)
+        return self.apply(image, box), box
+
+    def find_boxes_batch(
+        self,
+        images: Sequence[Image.Image | np.ndarray],
+    ) -> List[Box]:
+        """
+        Найти bbox для батча изображений (cv2 отпускает GIL,
+        поэтому используется пул потоков).
+        """
+        if self.max_workers is None or self.max_workers <= 1 or len(images) <= 1:
+            return [self.find_box(image) for image in images]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(self.find_box, images))
+
+    def crop_batch(
+        self,
+        images: Sequence[Image.Image | np.ndarray],
+    ) -> Tuple[List[np.ndarray], List[Box]]:
+        """
+        Обрезать батч изображений.
+        """
+        arrays = [to_numpy(image) for image in images]
+        boxes = self.find_boxes_batch(arrays)
+        return [self.apply(a, b) for a, b in zip(arrays, boxes)], boxes
+
+    def add_boxes(
+        self,
+        batch: Dict[str, List[Any]],
+        image_column: str = "image",
+    ) -> Dict[str, List[Any]]:
+        """
+        HF batch-функция для ds.map(..., batched=True): вычисляет bbox
+        и сохраняет их в колонку box_column. Результат map кешируется
+        datasets, поэтому поиск bbox выполняется один раз на датасет.
+        """
+        boxes = self.find_boxes_batch(batch[image_column])
+        return {self.box_column: [list(box) for box in boxes]}
+
+    def crop_with_boxes(
+        self,
+        batch: Dict[str, List[Any]],
+        image_column: str = "image",
+    ) -> Dict[str, List[Any]]:
+        """
+        HF batch-функция для with_transform: обрезает изображения
+        по сохранённым в box_column bbox.
+        """
+        batch[image_column] = [
+            self.apply(image, tuple(box))
+            for image, box in zip(batch[image_column], batch[self.box_column])
+        ]
+        return batch
+
+
+def crop_to_ink(
+    image: Image.Image | np.ndarray,
+    pad: int = 20,
+    min_area: int = 2000,
+) -> np.ndarray:
+    """
+    Совместимая с ноутбуком обёртка над InkCropper (результат в RGB).
+    """
+    return InkCropper(pad=pad, min_area=min_area, channels="rgb")(image)[0]
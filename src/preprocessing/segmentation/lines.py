@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from ..utils.image import binarize_ink, downscale, to_gray, to_numpy
+
+Box = Tuple[int, int, int, int]
+
+
+def find_runs(mask: np.ndarray, min_length: int = 1) -> np.ndarray:
+    """
+    Найти непрерывные участки True в одномерной маске.
+
+    Args:
+        mask - Одномерная булева маска
+        min_length - Минимальная длина участка
+    Returns:
+        runs - Массив формы (N, 2) с полуинтервалами [start, end)
+    """
+    mask = np.asarray(mask, dtype=bool)
+    if mask.size == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # Границы участков — места, где маска меняет значение
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    keep = (ends - starts) >= min_length
+    return np.stack([starts[keep], ends[keep]], axis=1)
+
+
+class LineSegmenter:
+    """
+    Сегментация страницы на строки по горизонтальной проекции.
+
+    Args:
+        pad - отступ (в пикселях) сверху и снизу строки
+        min_line_h - минимальная высота строки в пикселях исходного изображения
+        max_side - если задан, бинаризация и проекция считаются на копии,
+            уменьшенной до max_side по большей стороне (для больших сканов)
+        percentile - перцентиль заполненности строк для порога
+        ratio - доля перцентиля, выше которой строка считается текстом
+        median_ksize - размер медианного фильтра для чистки шума (0 — отключить)
+        max_workers - число потоков для обработки батча страниц
+
+    Строки возвращаются как bbox (x0, y0, x1, y1) или как срезы
+    numpy-массива страницы (view без копирования).
+    """
+
+    def __init__(
+        self,
+        pad: int = 8,
+        min_line_h: int = 18,
+        max_side: Optional[int] = None,
+        percentile: float = 70.0,
+        ratio: float = 0.25,
+        median_ksize: int = 3,
+        max_workers: Optional[int] = None,
+    ):
+        if min_line_h < 1:
+            raise ValueError("min_line_h must be >= 1")
+        if median_ksize and median_ksize % 2 == 0:
+            raise ValueError("median_ksize must be odd")
+
+        self.pad = pad
+        self.min_line_h = min_line_h
+        self.max_side = max_side
+        self.percentile = percentile
+        self.ratio = ratio
+        self.median_ksize = median_ksize
+        self.max_workers = max_workers
+
+    def find_lines(self, image: Image.Image | np.ndarray) -> List[Box]:
+        """
+        Найти строки на странице.
+
+        Args:
+            image - Страница в формате PIL.Image или numpy.ndarray
+        Returns:
+            boxes - Список bbox строк (x0, y0, x1, y1) в координатах страницы
+        """
+        gray = to_gray(image)
+        h, w = gray.shape
+        small, scale = downscale(gray, self.max_side)
+
+        # 1) бинаризация (инверт: чернила=255) и чистка шума
+        thr = binarize_ink(small)
+        if self.median_ksize:
+            thr = cv2.medianBlur(thr, self.median_ksize)
+
+        # 2) горизонтальная проекция: число пикселей чернил в каждой строке
+        row_ink = np.count_nonzero(thr, axis=1)
+        t = np.percentile(row_ink, self.percentile) * self.ratio
+        mask = row_ink > t
+
+        # 3) непрерывные интервалы строк в координатах уменьшенной копии
+        min_len = max(1, int(np.ceil(self.min_line_h * scale)))
+        runs = find_runs(mask, min_length=min_len)
+        if len(runs) == 0:
+            return []
+
+        # 4) возвращаемся к исходному разрешению и добавляем отступы
+        y0 = np.floor(runs[:, 0] / scale).astype(np.int64) - self.pad
+        y1 = np.ceil(runs[:, 1] / scale).astype(np.int64) + self.pad
+        y0 = np.clip(y0, 0, h)
+        y1 = np.clip(y1, 0, h)
+
+        return [(0, int(a), w, int(b)) for a, b in zip(y0, y1)]
+
+    def split(self, image: Image.Image | np.ndarray) -> List[np.ndarray]:
+        """
+        Разрезать страницу на строки.
+
+        Args:
+            image - Страница в формате PIL.Image или numpy.ndarray
+        Returns:
+            lines - Список срезов страницы (view, без копирования)
+        """
+        page = to_numpy(image)
+        return [page[y0:y1, x0:x1] for x0, y0, x1, y1 in self.find_lines(page)]
+
+    def find_lines_batch(
+        self,
+        images: Sequence[Image.Image | np.ndarray],
+    ) -> List[List[Box]]:
+        """
+        Найти строки для батча страниц. cv2 отпускает GIL,
+        поэтому страницы обрабатываются в пуле потоков.
+        """
+        if self.max_workers is None or self.max_workers <= 1 or len(images) <= 1:
+            return [self.find_lines(image) for image in images]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(self.find_lines, images))
+
+    def split_batch(
+        self,
+        images: Sequence[Image.Image | np.ndarray],
+    ) -> List[List[np.ndarray]]:
+        """
+        Разрезать батч страниц на строки.
+        """
+        pages = [to_numpy(image) for image in images]
+        boxes = self.find_lines_batch(pages)
+        return [
+            [page[y0:y1, x0:x1] for x0, y0, x1, y1 in page_boxes]
+            for page, page_boxes in zip(pages, boxes)
+        ]
+
+    def __call__(self, image: Image.Image | np.ndarray) -> List[np.ndarray]:
+        return self.split(image)
+
+
+def split_lines_projection(
+    image: Image.Image | np.ndarray,
+    pad: int = 8,
+    min_line_h: int = 18,
+) -> List[np.ndarray]:
+    """
+    Совместимая с ноутбуком обёртка над LineSegmenter.split.
+    """
+    return LineSegmenter(pad=pad, min_line_h=min_line_h).split(image)
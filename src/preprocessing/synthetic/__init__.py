@@ -0,0 +1,7 @@
+from .generator import SyntheticLineGenerator, generate_dataset, load_corpus
+from .glyphs import DEFAULT_CHARSET, Glyph, GlyphAtlas, find_fonts, get_atlas
+from .renderer import LineRenderer
+
+__all__ = ['SyntheticLineGenerator', 'generate_dataset', 'load_corpus',
+           'DEFAULT_CHARSET', 'Glyph', 'GlyphAtlas', 'find_fonts', 'get_atlas',
+           'LineRenderer']
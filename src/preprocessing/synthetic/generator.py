@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from ..writers import ParquetShardWriter
+from .renderer import LineRenderer
+
+
+def load_corpus(path: str, min_chars: int = 1) -> List[str]:
+    """
+    Корпус строк из текстового файла (одна строка — один пример).
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = [" ".join(line.split()) for line in f]
+    return [line for line in lines if len(line) >= min_chars]
+
+
+class SyntheticLineGenerator:
+    """
+    Генератор синтетических рукописных строк.
+
+    Пример idx полностью определяется (seed, idx): текст из корпуса,
+    параметры рендера и, если передан pipeline, выбор аугментации
+    (AugmentationPipeline с seed выбирает её по idx).
+
+    Args:
+        corpus - строки текста
+        renderer - LineRenderer
+        pipeline - AugmentationPipeline (опционально)
+        seed - сид генерации
+        max_chars - максимальная длина строки (длинные строки режутся
+            на случайный фрагмент по границам слов)
+    """
+
+    def __init__(
+        self,
+        corpus: Sequence[str],
+        renderer: LineRenderer,
+        pipeline: Optional[Any] = None,
+        seed: int = 0,
+        max_chars: Optional[int] = 64,
+    ):
+        if not corpus:
+            raise ValueError("corpus must not be empty")
+
+        self.corpus = list(corpus)
+        self.renderer = renderer
+        self.pipeline = pipeline
+        self.seed = seed
+        self.max_chars = max_chars
+
+    def _text(self, rng: np.random.Generator) -> str:
+        text = self.corpus[int(rng.integers(len(self.corpus)))]
+        if self.max_chars is None or len(text) <= self.max_chars:
+            return text
+
+        words = text.split(" ")
+        start = int(rng.integers(len(words)))
+        fragment = words[start]
+        for word in words[start + 1:]:
+            if len(fragment) + 1 + len(word) > self.max_chars:
+                break
+            fragment = f"{fragment} {word}"
+        return fragment[:self.max_chars]
+
+    def sample(self, idx: int) -> Dict[str, Any]:
+        """
+        Сгенерировать пример.
+
+        Returns:
+            dict - image (np.ndarray, grayscale uint8), text, render (параметры
+                рендера), aug_meta (метаданные аугментации или None)
+        """
+        rng = np.random.default_rng([self.seed, idx])
+        text = self._text(rng)
+        image, render = self.renderer.render(text, rng)
+
+        meta = None
+        if self.pipeline is not None:
+            image, meta = self.pipeline(image, idx=idx)
+
+        return {"image": image, "text": text, "render": render, "aug_meta": meta}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        idx = 0
+        while True:
+            yield self.sample(idx)
+            idx += 1
+
+
+_generator: Optional[SyntheticLineGenerator] = None
+
+
+def _init_worker(generator: SyntheticLineGenerator) -> None:
+    global _generator
+    _generator = generator
+    _generator.renderer.warm()
+
+
+def _render_range(task: Tuple[int, int]) -> List[Tuple[bytes, str]]:
+    start, stop = task
+    rows = []
+    for idx in range(start, stop):
+        sample = _generator.sample(idx)
+        ok, buf = cv2.imencode(".png", np.asarray(sample["image"]))
+        if not ok:
+            raise ValueError(f"Failed to encode synthetic sample {idx}")
+        rows.append((buf.tobytes(), sample["text"]))
+    return rows
+
+
+def generate_dataset(
+    generator: SyntheticLineGenerator,
+    out_dir: str,
+    num_lines: int,
+    start: int = 0,
+    dataset: str = "synthetic",
+    split: str = "train",
+    rows_per_shard: int = 1000,
+    num_workers: Optional[int] = None,
+    chunk_size: int = 256,
+) -> List[str]:
+    """
+    Сгенерировать строки и записать их шардами Parquet (схема DATASET_SCHEMA).
+
+    Рендер и аугментации выполняются в пуле процессов: генератор
+    передаётся в каждый воркер один раз (initializer), кеш глифов живёт
+    в воркере всё время генерации. Порядок строк детерминирован (по idx).
+
+    Args:
+        generator - SyntheticLineGenerator
+        out_dir - директория для шардов
+        num_lines - число строк
+        start - первый idx (для дозаписи новых строк)
+        dataset - значение колонки dataset
+        split - сплит (и префикс имён шардов)
+        rows_per_shard - строк в одном шарде
+        num_workers - число процессов (None или 1 — без пула)
+        chunk_size - строк в одной задаче воркера
+    Returns:
+        list - пути записанных шардов
+    """
+    tasks = [(i, min(i + chunk_size, start + num_lines)) for i in range(start, start + num_lines, chunk_size)]
+
+    executor = None
+    if num_workers and num_workers > 1:
+        executor = ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker,
+                                       initargs=(generator,))
+        chunks = executor.map(_render_range, tasks)
+    else:
+        _init_worker(generator)
+        chunks = map(_render_range, tasks)
+
+    writer = ParquetShardWriter(out_dir, prefix=split, rows_per_shard=rows_per_shard)
+    try:
+        for (first, _), rows in zip(tasks, chunks):
+            for offset, (data, text) in enumerate(rows):
+                writer.write({
+                    "image": {"bytes": data, "path": os.path.join(dataset, f"{first + offset:08d}.png")},
+                    "text": text,
+                    "dataset": dataset,
+                    "split": split,
+                    "source_split": split,
+                })
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return writer.close()
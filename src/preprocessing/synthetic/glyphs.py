@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+CYRILLIC = "".join(chr(c) for c in range(ord("А"), ord("я") + 1)) + "Ёё"
+DIGITS = "0123456789"
+PUNCTUATION = " .,;:!?-–—()«»\"'/№%"
+
+DEFAULT_CHARSET = CYRILLIC + DIGITS + PUNCTUATION
+
+FONT_EXTENSIONS = (".ttf", ".otf")
+
+
+@dataclass
+class Glyph:
+    """
+    Растеризованный глиф в разреженном виде.
+
+    Хранятся только пиксели с ненулевым покрытием, смещённые
+    относительно точки на базовой линии, поэтому строку можно собрать
+    одной операцией над конкатенацией глифов.
+
+    Args:
+        ys, xs - координаты пикселей относительно начала глифа на базовой линии
+        values - покрытие (0..255)
+        advance - ширина глифа (сдвиг пера)
+    """
+
+    ys: np.ndarray
+    xs: np.ndarray
+    values: np.ndarray
+    advance: float
+
+
+class GlyphAtlas:
+    """
+    Кеш растеризованных глифов одного шрифта одного размера.
+
+    Каждый символ растеризуется через PIL один раз (при первом
+    использовании или в warm), дальше строки собираются из кеша.
+
+    Args:
+        font_path - путь к TTF/OTF шрифту
+        size - кегль в пикселях
+    """
+
+    def __init__(self, font_path: str, size: int):
+        self.font_path = font_path
+        self.size = int(size)
+        self.font = ImageFont.truetype(font_path, self.size)
+
+        ascent, descent = self.font.getmetrics()
+        self.ascent = int(ascent)
+        self.descent = int(descent)
+
+        self._glyphs: Dict[str, Glyph] = {}
+
+    def _rasterize(self, char: str) -> Glyph:
+        left, top, right, bottom = self.font.getbbox(char, anchor="ls")
+        advance = float(self.font.getlength(char))
+
+        width, height = right - left, bottom - top
+        if width <= 0 or height <= 0:
+            empty = np.zeros(0, dtype=np.int32)
+            return Glyph(empty, empty, np.zeros(0, dtype=np.uint8), advance)
+
+        canvas = Image.new("L", (width, height), 0)
+        ImageDraw.Draw(canvas).text((-left, -top), char, font=self.font, fill=255, anchor="ls")
+        bitmap = np.asarray(canvas)
+
+        ys, xs = np.nonzero(bitmap)
+        return Glyph(
+            ys=(ys + top).astype(np.int32),
+            xs=(xs + left).astype(np.int32),
+            values=bitmap[ys, xs],
+            advance=advance,
+        )
+
+    def glyph(self, char: str) -> Glyph:
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            glyph = self._rasterize(char)
+            self._glyphs[char] = glyph
+        return glyph
+
+    def glyphs(self, text: str) -> List[Glyph]:
+        return [self.glyph(char) for char in text]
+
+    def warm(self, chars: Iterable[str] = DEFAULT_CHARSET) -> "GlyphAtlas":
+        """
+        Заранее растеризовать набор символов.
+        """
+        for char in chars:
+            self.glyph(char)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._glyphs)
+
+
+# Атласы процесса без ограничения размера: LineRenderer.warm заполняет
+# его всеми шрифтами и кеглями, и вытеснение означало бы повторную растеризацию
+_ATLASES: Dict[Tuple[str, int], GlyphAtlas] = {}
+
+
+def get_atlas(font_path: str, size: int) -> GlyphAtlas:
+    """
+    Атлас шрифта и размера, общий для процесса (кеш на время жизни воркера).
+    """
+    key = (font_path, int(size))
+    atlas = _ATLASES.get(key)
+    if atlas is None:
+        atlas = GlyphAtlas(font_path, size)
+        _ATLASES[key] = atlas
+    return atlas
+
+
+def find_fonts(path: str) -> List[str]:
+    """
+    Шрифты в директории (рекурсивно) или один файл шрифта.
+    """
+    if os.path.isfile(path):
+        return [path]
+
+    fonts: List[str] = []
+    for root, _, files in os.walk(path):
+        for name in files:
+            if name.lower().endswith(FONT_EXTENSIONS):
+                fonts.append(os.path.join(root, name))
+
+    if not fonts:
+        raise ValueError(f"No fonts found in {path}")
+    return sorted(fonts)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .glyphs import DEFAULT_CHARSET, get_atlas
+
+
+class LineRenderer:
+    """
+    Рендер строки текста из кеша глифов.
+
+    Глифы растеризуются один раз на (шрифт, кегль) — см. GlyphAtlas, —
+    а строка собирается векторно: координаты пикселей всех глифов
+    конкатенируются, сдвигаются на позиции пера и одним np.maximum.at
+    переносятся на холст. Вариативность «почерка»: шрифт и кегль на
+    строку, межбуквенный интервал, дрожание базовой линии по символам,
+    цвет чернил и фона.
+
+    Args:
+        fonts - пути к шрифтам (должны покрывать кириллицу)
+        size_range - диапазон кегля (пиксели)
+        spacing_range - диапазон добавки к межбуквенному интервалу
+        jitter - максимальное смещение символа от базовой линии (пиксели)
+        ink_range - диапазон яркости чернил
+        background_range - диапазон яркости фона
+        padding - отступы (по вертикали, по горизонтали)
+        charset - символы для предварительной растеризации (warm)
+    """
+
+    def __init__(
+        self,
+        fonts: Sequence[str],
+        size_range: Tuple[int, int] = (28, 48),
+        spacing_range: Tuple[float, float] = (-1.0, 2.0),
+        jitter: int = 1,
+        ink_range: Tuple[int, int] = (0, 70),
+        background_range: Tuple[int, int] = (225, 255),
+        padding: Tuple[int, int] = (8, 16),
+        charset: Optional[str] = DEFAULT_CHARSET,
+    ):
+        if not fonts:
+            raise ValueError("fonts must not be empty")
+        if size_range[0] <= 0 or size_range[0] > size_range[1]:
+            raise ValueError("size_range must be a positive (min, max) range")
+
+        self.fonts = list(fonts)
+        self.size_range = size_range
+        self.spacing_range = spacing_range
+        self.jitter = jitter
+        self.ink_range = ink_range
+        self.background_range = background_range
+        self.padding = padding
+        self.charset = charset
+
+    def warm(self) -> None:
+        """
+        Растеризовать charset для всех шрифтов и кеглей (например, в воркере).
+        """
+        if not self.charset:
+            return
+        for font in self.fonts:
+            for size in range(self.size_range[0], self.size_range[1] + 1):
+                get_atlas(font, size).warm(self.charset)
+
+    def render(
+        self,
+        text: str,
+        rng: np.random.Generator,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Отрисовать строку.
+
+        Args:
+            text - текст строки
+            rng - генератор случайных чисел (детерминирует результат)
+        Returns:
+            image - grayscale uint8
+            params - шрифт и параметры рендера
+        """
+        font = self.fonts[int(rng.integers(len(self.fonts)))]
+        size = int(rng.integers(self.size_range[0], self.size_range[1] + 1))
+        atlas = get_atlas(font, size)
+
+        spacing = float(rng.uniform(*self.spacing_range))
+        ink = int(rng.integers(self.ink_range[0], self.ink_range[1] + 1))
+        background = int(rng.integers(self.background_range[0], self.background_range[1] + 1))
+        pad_y, pad_x = self.padding
+
+        glyphs = atlas.glyphs(text)
+        n = len(glyphs)
+
+        advances = np.fromiter((g.advance for g in glyphs), dtype=np.float64, count=n)
+        pen = np.concatenate([[0.0], np.cumsum(advances + spacing)[:-1]]) if n else advances
+        pen = np.round(pen).astype(np.int32) + pad_x
+
+        baseline = pad_y + atlas.ascent
+        if self.jitter:
+            shifts = rng.integers(-self.jitter, self.jitter + 1, size=n).astype(np.int32)
+        else:
+            shifts = np.zeros(n, dtype=np.int32)
+
+        counts = np.fromiter((g.ys.size for g in glyphs), dtype=np.int64, count=n)
+        height = atlas.ascent + atlas.descent + 2 * pad_y + 2 * self.jitter
+        width = int(pen[-1] + max(advances[-1], 1)) + pad_x if n else 2 * pad_x
+
+        coverage = np.zeros((height, max(width, 1)), dtype=np.uint8)
+        if counts.sum():
+            ys = np.concatenate([g.ys for g in glyphs]) + np.repeat(baseline + self.jitter + shifts, counts)
+            xs = np.concatenate([g.xs for g in glyphs]) + np.repeat(pen, counts)
+            values = np.concatenate([g.values for g in glyphs])
+
+            ok = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < coverage.shape[1])
+            np.maximum.at(coverage, (ys[ok], xs[ok]), values[ok])
+
+        # Смешиваем фон и чернила по покрытию
+        scale = (background - ink) / 255.0
+        image = (background - coverage * scale).astype(np.uint8)
+
+        return image, {"font": font, "size": size, "spacing": spacing, "ink": ink, "background": background}
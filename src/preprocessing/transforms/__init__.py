@@ -1,16 +1,36 @@
-from .scale import ScaleAugmentation
-from .shear import ShearAugmentation
-from .erosion import ErosionAugmentation
-from .dilation import DilationAugmentation
-from .griddistortion import GridDistortionAugmentation
-from .motion_blur import MotionBlurAugmentation
-from .elastic_transform import ElasticTransformAugmentation
-from .bad_photo_copy import BadPhotoCopyAugmentation
-from .watermark import WaterMarkAugmentation
-from .scribbles import ScribblesAugmentation
-
-__all__ = ['ScaleAugmentation',  'ShearAugmentation', 'ErosionAugmentation',
-           'DilationAugmentation', 'GridDistortionAugmentation',
-           'MotionBlurAugmentation', 'ElasticTransformAugmentation',
-           'BadPhotoCopyAugmentation', 'WaterMarkAugmentation',
-           'ScribblesAugmentation']
+import importlib
+from typing import Any, List
+
+from .base import BaseAugmentation
+from .registry import (available_transforms, class_module, create_transform,
+                       get_transform, register_transform, transform_name)
+
+# Классы аугментаций импортируются лениво (PEP 562): модуль с классом и
+# его тяжёлые зависимости загружаются при первом обращении к имени.
+_LAZY_CLASSES = ['ScaleAugmentation', 'ShearAugmentation', 'ErosionAugmentation',
+                 'DilationAugmentation', 'GridDistortionAugmentation',
+                 'MotionBlurAugmentation', 'ElasticTransformAugmentation',
+                 'BadPhotoCopyAugmentation', 'WaterMarkAugmentation',
+                 'ScribblesAugmentation']
+
+# Батчевый torch-бэкенд: torch импортируется только при обращении
+_LAZY_BACKEND = {'TorchBatchAugmenter': 'torch_backend',
+                 'augment_batch': 'torch_backend'}
+
+__all__ = _LAZY_CLASSES + list(_LAZY_BACKEND) + [
+    'BaseAugmentation', 'available_transforms', 'create_transform',
+    'get_transform', 'register_transform', 'transform_name']
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_CLASSES or name in _LAZY_BACKEND:
+        module_name = _LAZY_BACKEND.get(name) or class_module(name)
+        module = importlib.import_module(f".{module_name}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
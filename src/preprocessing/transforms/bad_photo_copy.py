@@ -5,10 +5,12 @@ import random
 
 import numpy as np
 from PIL import Image
-from augraphy import BadPhotoCopy
 
+from ..utils.imports import lazy_import
 from .base import BaseAugmentation
 
+augraphy = lazy_import("augraphy")
+
 
 class BadPhotoCopyAugmentation(BaseAugmentation):
     """
@@ -23,6 +25,14 @@ class BadPhotoCopyAugmentation(BaseAugmentation):
     """
 
     name = "bad_photo_copy"
+    param_schema = {
+        "noise_type": "int32",
+        "noise_iteration": "int32",
+        "noise_size": "int32",
+        "noise_sparsity": "float32",
+        "noise_concentration": "float32",
+    }
+    requires = ("augraphy",)
 
     def __init__(
         self,
@@ -62,7 +72,7 @@ class BadPhotoCopyAugmentation(BaseAugmentation):
         if is_pil:
             image = np.array(image)
 
-        transform = BadPhotoCopy(
+        transform = augraphy.BadPhotoCopy(
             noise_type=params["noise_type"],
             noise_side="random",
             noise_iteration=params["noise_iteration"],
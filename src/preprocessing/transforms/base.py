@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import importlib
+import inspect
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 from PIL import Image
@@ -23,24 +26,174 @@ class BaseAugmentation(ABC):
 
     name: str = "base"
 
+    # Тяжёлые модули (albumentations, augraphy), нужные аугментации.
+    # Импортируются при создании экземпляра, а не при импорте пакета.
+    requires: Tuple[str, ...] = ()
+
+    # Схема скалярных параметров: имя -> dtype numpy ("float32", "int32",
+    # "bool", "str"). По ней строятся компактные метаданные (scalar_params)
+    param_schema: Dict[str, str] = {}
+
+    # Локальная операция: пиксель результата зависит только от окрестности
+    # радиуса tile_halo(params), поэтому большую страницу можно обработать
+    # тайлами (см. apply_tiled)
+    tileable: bool = False
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "BaseAugmentation":
+        for module in cls.requires:
+            importlib.import_module(module)
+
+        instance = super().__new__(cls)
+
+        # Запоминаем аргументы конструктора (с учётом значений по умолчанию),
+        # чтобы аугментацию можно было описать как (имя, аргументы)
+        bound = inspect.signature(cls.__init__).bind_partial(instance, *args, **kwargs)
+        bound.apply_defaults()
+        init_args = dict(bound.arguments)
+        init_args.pop(next(iter(init_args)))  # self
+        instance._init_args = init_args
+
+        return instance
+
+    @property
+    def init_args(self) -> Dict[str, Any]:
+        """
+        Аргументы, с которыми была создана аугментация.
+        """
+        return dict(getattr(self, "_init_args", {}))
+
     def __call__(
         self,
         image: Image.Image | np.ndarray,
+        tile_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
     ) -> Tuple[Image.Image | np.ndarray, Dict[str, Any]]:
         """
         Применить аугментацию к изображению.
 
         Args:
             image - Изображение в формате PIL.Image или numpy.ndarray
+            tile_size - если задан и аугментация локальная (tileable),
+                изображения больше tile_size обрабатываются тайлами
+            max_workers - число потоков для тайлов
         Returns
             image - Аугментированное изображение
             params - Фактически использованные параметры аугментации
         """
 
         params = self.sample_params()
-        image = self.apply(image, params)
+        if tile_size and self.tileable and max(_image_size(image)) > tile_size:
+            image = self.apply_tiled(image, params, tile_size=tile_size, max_workers=max_workers)
+        else:
+            image = self.apply(image, params)
         return image, params
 
+    def scalar_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Компактное представление параметров: только скаляры из param_schema.
+
+        Диапазоны вида (v, v), которые передаются в augraphy, сворачиваются
+        в одно значение; массивы и служебные поля отбрасываются.
+        """
+        compact: Dict[str, Any] = {}
+        for key in self.param_schema:
+            value = params.get(key)
+            if isinstance(value, (tuple, list)):
+                value = value[0] if value else None
+            if hasattr(value, "item") and callable(value.item):  # numpy-скаляры
+                value = value.item()
+            compact[key] = value
+        return compact
+
+    def tile_halo(self, params: Dict[str, Any]) -> int:
+        """
+        Радиус окрестности (в пикселях), от которой зависит пиксель результата.
+        """
+        return 0
+
+    def prepare_tiles(self, shape: Tuple[int, ...], params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Подготовить параметры для обработки тайлами.
+
+        Вызывается один раз на изображение: здесь фиксируется всё, что
+        в apply семплируется внутри (ядра, положение объектов), чтобы
+        все тайлы обработались согласованно.
+
+        Args:
+            shape - форма полного изображения
+            params - параметры из sample_params
+        Returns:
+            dict - параметры для apply_tile
+        """
+        return params
+
+    def apply_tile(
+        self,
+        tile: np.ndarray,
+        params: Dict[str, Any],
+        origin: Tuple[int, int],
+    ) -> np.ndarray:
+        """
+        Обработать один тайл (с halo).
+
+        Args:
+            tile - фрагмент изображения
+            params - параметры из prepare_tiles
+            origin - (y, x) левого верхнего угла тайла в координатах страницы
+        """
+        return self.apply(tile, params)
+
+    def apply_tiled(
+        self,
+        image: Image.Image | np.ndarray,
+        params: Dict[str, Any],
+        tile_size: int = 1024,
+        max_workers: Optional[int] = None,
+    ) -> Image.Image | np.ndarray:
+        """
+        Применить аугментацию тайлами с перекрытием.
+
+        Каждый тайл расширяется на tile_halo(params) пикселей, обрабатывается
+        отдельно (тайлы — параллельно в потоках: cv2 и numpy отпускают GIL),
+        а его внутренняя часть пишется в общий выходной буфер. Пиковая память
+        ограничена промежуточными массивами тайлов, а не всей страницы.
+        """
+        if not self.tileable:
+            raise ValueError(f"Transform '{self.name}' does not support tiled processing")
+        if tile_size <= 0:
+            raise ValueError("tile_size must be > 0")
+
+        is_pil = isinstance(image, Image.Image)
+        if is_pil:
+            image = np.array(image)
+
+        tile_params = self.prepare_tiles(image.shape, params)
+        halo = int(self.tile_halo(tile_params))
+        h, w = image.shape[:2]
+        out = np.empty_like(image)
+
+        boxes: List[Tuple[int, int, int, int]] = [
+            (y0, min(y0 + tile_size, h), x0, min(x0 + tile_size, w))
+            for y0 in range(0, h, tile_size)
+            for x0 in range(0, w, tile_size)
+        ]
+
+        def work(box: Tuple[int, int, int, int]) -> None:
+            y0, y1, x0, x1 = box
+            py0, px0 = max(0, y0 - halo), max(0, x0 - halo)
+            py1, px1 = min(h, y1 + halo), min(w, x1 + halo)
+            result = self.apply_tile(image[py0:py1, px0:px1], tile_params, (py0, px0))
+            out[y0:y1, x0:x1] = result[y0 - py0:y1 - py0, x0 - px0:x1 - px0]
+
+        if max_workers == 1 or len(boxes) == 1:
+            for box in boxes:
+                work(box)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(work, boxes))
+
+        return Image.fromarray(out) if is_pil else out
+
     @abstractmethod
     def sample_params(self) -> Dict[str, Any]:
         """
@@ -68,3 +221,9 @@ class BaseAugmentation(ABC):
             image - Аугментированное изображение
         """
         raise NotImplementedError
+
+
+def _image_size(image: Image.Image | np.ndarray) -> Tuple[int, int]:
+    if isinstance(image, Image.Image):
+        return image.height, image.width
+    return image.shape[0], image.shape[1]
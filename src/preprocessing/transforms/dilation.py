@@ -16,6 +16,10 @@ class DilationAugmentation(BaseAugmentation):
     Параметры управляют размером ядра и количеством итераций.
     """
 
+    name = "dilation"
+    param_schema = {"kernel_h": "int32", "kernel_w": "int32", "iterations": "int32"}
+    tileable = True
+
     def __init__(
         self,
         kernal_size_range: Tuple[int, int] = (3, 4),
@@ -40,19 +44,23 @@ class DilationAugmentation(BaseAugmentation):
         if is_pil:
             image = np.array(image)
 
-        kernal = params["kernal"]
+        kernal = np.ones((params["kernel_h"], params["kernel_w"]), np.uint8)
         iterations = params["iterations"]
 
         image = cv2.dilate(image, kernal, iterations=iterations)
 
         return Image.fromarray(image) if is_pil else image
 
+    def tile_halo(self, params: Dict[str, Any]) -> int:
+        return max(params["kernel_h"], params["kernel_w"]) * max(1, params["iterations"])
+
     def sample_params(self) -> Dict[str, Any]:
         h = random.randint(*self.kernal_size_range)
         w = random.randint(*self.kernal_size_range)
         iterations = random.randint(*self.iterations_range)
 
         return {
-            "kernal": np.ones((h, w), np.uint8),
+            "kernel_h": h,
+            "kernel_w": w,
             "iterations": iterations,
         }
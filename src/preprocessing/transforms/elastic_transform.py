@@ -1,12 +1,14 @@
 from typing import Any, Dict, Tuple
 import random
 
-import albumentations as A
 import numpy as np
 from PIL import Image
 
+from ..utils.imports import lazy_import
 from .base import BaseAugmentation
 
+A = lazy_import("albumentations")
+
 
 class ElasticTransformAugmentation(BaseAugmentation):
     """
@@ -18,6 +20,8 @@ class ElasticTransformAugmentation(BaseAugmentation):
     """
 
     name = "elastic_transform"
+    param_schema = {"alpha": "float32", "sigma": "float32"}
+    requires = ("albumentations",)
 
     def __init__(
         self,
@@ -16,6 +16,11 @@ class ErosionAugmentation(BaseAugmentation):
         kernal_size_range: диапазон размеров ядра Tuple[int, int].
         iterations_rnage: диапазон количества итераций Tuple[int, int].
     """
+
+    name = "erosion"
+    param_schema = {"kernel_h": "int32", "kernel_w": "int32", "iterations": "int32"}
+    tileable = True
+
     def __init__(
         self,
         kernal_size_range: Tuple[int, int] = (3, 4),
@@ -40,18 +45,22 @@ class ErosionAugmentation(BaseAugmentation):
         if is_pil:
             image = np.array(image)
 
-        kernal = params['kernal']
+        kernal = np.ones((params['kernel_h'], params['kernel_w']), np.uint8)
         iterations = params['iterations']
-        image = cv2.erode(image, kernal, iterations)
+        image = cv2.erode(image, kernal, iterations=iterations)
 
         return Image.fromarray(image) if is_pil else image
 
+    def tile_halo(self, params: Dict[str, Any]) -> int:
+        return max(params["kernel_h"], params["kernel_w"]) * max(1, params["iterations"])
+
     def sample_params(self) -> Dict[str, Any]:
         h = random.randint(*self.kernal_size_range)
         w = random.randint(*self.kernal_size_range)
         iterations = random.randint(*self.iterations_rnage)
 
         return {
-            "kernal": np.ones((h, w), np.uint8),
+            "kernel_h": h,
+            "kernel_w": w,
             "iterations": iterations,
         }
@@ -3,13 +3,15 @@ from __future__ import annotations
 from typing import Any, Dict, Tuple
 import random
 
-import albumentations as A
 import cv2
 import numpy as np
 from PIL import Image
 
+from ..utils.imports import lazy_import
 from .base import BaseAugmentation
 
+A = lazy_import("albumentations")
+
 
 class GridDistortionAugmentation(BaseAugmentation):
     """
@@ -21,6 +23,8 @@ class GridDistortionAugmentation(BaseAugmentation):
     """
 
     name = "grid_distortion"
+    param_schema = {"num_steps": "int32", "distort_limit": "float32"}
+    requires = ("albumentations",)
 
     def __init__(
         self,
@@ -1,12 +1,71 @@
 from typing import Any, Dict, Tuple
 import random
 
-import albumentations as A
+import cv2
 import numpy as np
 from PIL import Image
 
+from ..utils.imports import lazy_import
 from .base import BaseAugmentation
 
+A = lazy_import("albumentations")
+
+
+def motion_blur_kernel(
+    blur_limit: int,
+    angle: float,
+    direction: float,
+    shift: Tuple[float, float] = (0.0, 0.0),
+) -> np.ndarray:
+    """
+    Ядро motion blur по параметрам аугментации (как в albumentations).
+
+    В отличие от A.MotionBlur размер ядра не семплируется, а равен
+    blur_limit (приведённому к нечётному), поэтому ядро полностью
+    определяется параметрами и его можно применять вне albumentations.
+
+    Args:
+        blur_limit - размер ядра
+        angle - угол размытия (в градусах)
+        direction - направленность размытия в [-1, 1]
+        shift - смещение линии в долях половины длины (в [-1, 1])
+    Returns:
+        np.ndarray - нормированное ядро (ksize, ksize) float32
+    """
+    ksize = max(3, int(blur_limit))
+    if ksize % 2 == 0:
+        ksize -= 1
+
+    center = ksize // 2
+    line_length = ksize // 2
+    direction = float(np.clip(direction, -1.0, 1.0))
+
+    t_start = -line_length * (1.0 - max(direction, 0.0))
+    t_end = line_length * (1.0 - max(-direction, 0.0))
+    t = np.linspace(t_start, t_end, ksize)
+
+    angle_rad = np.deg2rad(angle)
+    x = center + np.cos(angle_rad) * t + shift[0] * line_length / 2
+    y = center + np.sin(angle_rad) * t + shift[1] * line_length / 2
+
+    x = np.clip(np.round(x), 0, ksize - 1).astype(int)
+    y = np.clip(np.round(y), 0, ksize - 1).astype(int)
+
+    kernel = np.zeros((ksize, ksize), dtype=np.float32)
+    kernel[y, x] = 1.0
+    return kernel / kernel.sum()
+
+
+def sample_kernel_size(blur_limit: int) -> int:
+    """
+    Размер ядра, как его семплирует A.MotionBlur(blur_limit=blur_limit):
+    нечётное число из [3, blur_limit] (чётные границы округляются вверх).
+    """
+    high = max(3, int(blur_limit))
+    if high % 2 == 0:
+        high += 1
+    return 3 + 2 * random.randint(0, (high - 3) // 2)
+
 
 class MotionBlurAugmentation(BaseAugmentation):
     """
@@ -14,6 +73,14 @@ class MotionBlurAugmentation(BaseAugmentation):
     """
 
     name = "motion_blur"
+    param_schema = {
+        "blur_limit": "int32",
+        "angle": "float32",
+        "direction": "float32",
+        "allow_shifted": "bool",
+    }
+    requires = ("albumentations",)
+    tileable = True
 
     def __init__(
         self,
@@ -70,3 +137,26 @@ class MotionBlurAugmentation(BaseAugmentation):
             return Image.fromarray(image)
 
         return image
+
+    def prepare_tiles(self, shape: Tuple[int, ...], params: Dict[str, Any]) -> Dict[str, Any]:
+        # A.MotionBlur семплирует размер и смещение ядра при каждом вызове,
+        # поэтому для тайлов ядро строится один раз на всё изображение —
+        # по тому же правилу, что и без тайлов
+        ksize = sample_kernel_size(params["blur_limit"])
+        shift = (0.0, 0.0)
+        if params["allow_shifted"]:
+            shift = (random.uniform(-1, 1), random.uniform(-1, 1))
+
+        kernel = motion_blur_kernel(ksize, params["angle"], params["direction"], shift)
+        return {**params, "kernel": kernel}
+
+    def tile_halo(self, params: Dict[str, Any]) -> int:
+        return params["kernel"].shape[0] // 2
+
+    def apply_tile(
+        self,
+        tile: np.ndarray,
+        params: Dict[str, Any],
+        origin: Tuple[int, int],
+    ) -> np.ndarray:
+        return cv2.filter2D(tile, -1, params["kernel"])
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+from .base import BaseAugmentation
+
+# name -> (модуль внутри пакета transforms, имя класса).
+# Модуль импортируется только при первом обращении к аугментации.
+_BUILTIN: Dict[str, Tuple[str, str]] = {
+    "scale": ("scale", "ScaleAugmentation"),
+    "shear": ("shear", "ShearAugmentation"),
+    "erosion": ("erosion", "ErosionAugmentation"),
+    "dilation": ("dilation", "DilationAugmentation"),
+    "grid_distortion": ("griddistortion", "GridDistortionAugmentation"),
+    "motion_blur": ("motion_blur", "MotionBlurAugmentation"),
+    "elastic_transform": ("elastic_transform", "ElasticTransformAugmentation"),
+    "bad_photo_copy": ("bad_photo_copy", "BadPhotoCopyAugmentation"),
+    "watermark": ("watermark", "WaterMarkAugmentation"),
+    "scribbles": ("scribbles", "ScribblesAugmentation"),
+}
+
+# Уже разрешённые и зарегистрированные пользователем классы
+_RESOLVED: Dict[str, Type[BaseAugmentation]] = {}
+
+
+def register_transform(
+    name: str,
+) -> Callable[[Type[BaseAugmentation]], Type[BaseAugmentation]]:
+    """
+    Декоратор регистрации собственной аугментации по имени.
+
+    Пример:
+        @register_transform("my_blur")
+        class MyBlur(BaseAugmentation): ...
+    """
+    def decorator(cls: Type[BaseAugmentation]) -> Type[BaseAugmentation]:
+        if name in _BUILTIN or (name in _RESOLVED and _RESOLVED[name] is not cls):
+            raise ValueError(f"Transform '{name}' is already registered")
+        _RESOLVED[name] = cls
+        return cls
+
+    return decorator
+
+
+def get_transform(name: str) -> Type[BaseAugmentation]:
+    """
+    Получить класс аугментации по имени (импортирует модуль при первом вызове).
+    """
+    if name in _RESOLVED:
+        return _RESOLVED[name]
+
+    if name not in _BUILTIN:
+        raise KeyError(f"Unknown transform '{name}'. Available: {available_transforms()}")
+
+    module_name, class_name = _BUILTIN[name]
+    module = importlib.import_module(f"{__package__}.{module_name}")
+    cls = getattr(module, class_name)
+    _RESOLVED[name] = cls
+    return cls
+
+
+def create_transform(name: str, **kwargs: Any) -> BaseAugmentation:
+    """
+    Создать аугментацию по имени и аргументам конструктора.
+    """
+    return get_transform(name)(**kwargs)
+
+
+def transform_name(cls: Type[BaseAugmentation]) -> str:
+    """
+    Имя, под которым класс аугментации зарегистрирован.
+    """
+    for name, registered in _RESOLVED.items():
+        if registered is cls:
+            return name
+
+    for name, (module_name, class_name) in _BUILTIN.items():
+        if cls.__name__ == class_name and cls.__module__ == f"{__package__}.{module_name}":
+            return name
+
+    raise KeyError(f"Transform class {cls.__name__} is not registered")
+
+
+def available_transforms() -> List[str]:
+    return sorted(set(_BUILTIN) | set(_RESOLVED))
+
+
+def class_module(class_name: str) -> str:
+    """
+    Модуль встроенной аугментации по имени класса (для ленивого импорта).
+    """
+    for module_name, name in _BUILTIN.values():
+        if name == class_name:
+            return module_name
+    raise KeyError(class_name)
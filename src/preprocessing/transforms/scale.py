@@ -23,6 +23,7 @@ class ScaleAugmentation(BaseAugmentation):
     """
 
     name = "scale"
+    param_schema = {"scale": "float32"}
 
     def __init__(self, scale_range: tuple[float, float] = (0.8, 1.0)):
         """
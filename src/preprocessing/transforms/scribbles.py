@@ -5,10 +5,12 @@ import random
 
 import numpy as np
 from PIL import Image
-from augraphy.augmentations.scribbles import Scribbles
 
+from ..utils.imports import lazy_import
 from .base import BaseAugmentation
 
+scribbles = lazy_import("augraphy.augmentations.scribbles")
+
 
 class ScribblesAugmentation(BaseAugmentation):
     """
@@ -23,6 +25,14 @@ class ScribblesAugmentation(BaseAugmentation):
     """
 
     name = "scribbles"
+    param_schema = {
+        "size": "int32",
+        "count": "int32",
+        "thickness": "int32",
+        "brightness": "int32",
+        "rotation": "int32",
+    }
+    requires = ("augraphy.augmentations.scribbles",)
 
     def __init__(
         self,
@@ -62,7 +72,7 @@ class ScribblesAugmentation(BaseAugmentation):
         if is_pil:
             image = np.array(image)
 
-        transform = Scribbles(
+        transform = scribbles.Scribbles(
             scribbles_type="lines",
             scribbles_ink="pencil",
             scribbles_location="random",
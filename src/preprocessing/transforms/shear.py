@@ -14,6 +14,10 @@ class ShearAugmentation(BaseAugmentation):
     """
     Аугментация shear (сдвиг) по оси X и/или Y.
     """
+
+    name = "shear"
+    param_schema = {"phi_x": "float32", "phi_y": "float32", "kx": "float32", "ky": "float32"}
+
     def __init__(
         self,
         shear_x_range: Optional[tuple[float, float]] = None,
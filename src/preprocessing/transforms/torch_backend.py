@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from .base import BaseAugmentation
+from .motion_blur import motion_blur_kernel
+
+GEOMETRIC = ("scale", "shear", "grid_distortion", "elastic_transform")
+FILTERS = ("motion_blur", "erosion", "dilation")
+SUPPORTED = GEOMETRIC + FILTERS
+
+
+def _gaussian_kernels(sigmas: torch.Tensor, max_size: int) -> torch.Tensor:
+    """
+    Одномерные гауссовы ядра одинаковой длины для набора sigma.
+    """
+    radius = max_size // 2
+    t = torch.arange(-radius, radius + 1, dtype=torch.float32)
+    kernels = torch.exp(-0.5 * (t[None, :] / sigmas[:, None]) ** 2)
+    return kernels / kernels.sum(dim=1, keepdim=True)
+
+
+class TorchBatchAugmenter:
+    """
+    Батчевый torch-бэкенд для геометрических и фотометрических аугментаций.
+
+    Работает с уже собранным батчем (B, C, H, W) на CPU: параметры каждого
+    примера семплирует сама аугментация (sample_params), а применяются они
+    одной батчевой операцией — affine_grid / grid_sample для scale, shear,
+    grid_distortion и elastic_transform, групповая свёртка для motion_blur,
+    max-pool для erosion / dilation. Так внутри батча работает
+    внутриоперационный параллелизм torch и нет Python-цикла по картинкам.
+
+    Поддерживаемые аугментации — SUPPORTED (по атрибуту name).
+
+    Args:
+        fill - значение фона за пределами изображения (белый лист)
+        generator - torch.Generator для случайных полей elastic / grid
+        elastic_grid - шаг грубой сетки для поля elastic (1 — полное разрешение)
+    """
+
+    def __init__(
+        self,
+        fill: float = 255.0,
+        generator: Optional[torch.Generator] = None,
+        elastic_grid: int = 8,
+    ):
+        if elastic_grid < 1:
+            raise ValueError("elastic_grid must be >= 1")
+
+        self.fill = float(fill)
+        self.generator = generator
+        self.elastic_grid = int(elastic_grid)
+
+    @staticmethod
+    def supports(aug: Optional[BaseAugmentation]) -> bool:
+        return aug is None or getattr(aug, "name", None) in SUPPORTED
+
+    def sample_params(self, aug: BaseAugmentation) -> Dict[str, Any]:
+        """
+        Параметры аугментации для одного примера.
+
+        Для shear дополнительно семплируется масштаб встроенного ScaleAugmentation,
+        который в numpy-версии семплируется внутри apply.
+        """
+        params = aug.sample_params()
+        if aug.name == "shear":
+            params["scale"] = aug.scaler.sample_params()["scale"]
+        return params
+
+    def __call__(
+        self,
+        images: torch.Tensor,
+        augs: Sequence[Optional[BaseAugmentation]],
+    ) -> Tuple[torch.Tensor, List[Optional[Dict[str, Any]]]]:
+        """
+        Аугментировать батч: каждому примеру — своя аугментация (или None).
+
+        Args:
+            images - тензор (B, C, H, W), uint8 или float
+            augs - аугментации по примерам
+        Returns:
+            images - аугментированный батч того же dtype
+            params - параметры по примерам (None, если аугментации не было)
+        """
+        params = [None if aug is None else self.sample_params(aug) for aug in augs]
+        return self.apply(images, augs, params), params
+
+    def apply(
+        self,
+        images: torch.Tensor,
+        augs: Sequence[Optional[BaseAugmentation]],
+        params: Sequence[Optional[Dict[str, Any]]],
+    ) -> torch.Tensor:
+        """
+        Применить к батчу аугментации с заданными параметрами.
+        """
+        if images.ndim != 4:
+            raise ValueError("images must be a (B, C, H, W) tensor")
+        if len(augs) != images.shape[0] or len(params) != images.shape[0]:
+            raise ValueError("augs and params must match the batch size")
+
+        groups: Dict[str, List[int]] = {}
+        for i, aug in enumerate(augs):
+            if aug is None:
+                continue
+            if not self.supports(aug):
+                raise ValueError(f"Transform '{aug.name}' is not supported by the torch backend")
+            groups.setdefault(aug.name, []).append(i)
+
+        if not groups:
+            return images.clone()
+
+        dtype = images.dtype
+        x = images.float()
+        out = x.clone()
+
+        geometric = [i for name in GEOMETRIC for i in groups.get(name, [])]
+        if geometric:
+            grid = torch.cat([
+                self._grid(name, [params[i] for i in groups[name]], x.shape[-2:])
+                for name in GEOMETRIC if name in groups
+            ])
+            index = torch.tensor(geometric)
+            out[index] = self._sample(x[index], grid)
+
+        if "motion_blur" in groups:
+            index = torch.tensor(groups["motion_blur"])
+            out[index] = self._motion_blur(x[index], [params[i] for i in groups["motion_blur"]])
+
+        for name in ("erosion", "dilation"):
+            for i_list, (kh, kw, iterations) in self._morphology_groups(groups.get(name, []), params):
+                index = torch.tensor(i_list)
+                out[index] = self._morphology(x[index], kh, kw, iterations, erode=name == "erosion")
+
+        if dtype == torch.uint8:
+            return out.round_().clamp_(0, 255).to(torch.uint8)
+        return out.to(dtype)
+
+    def _sample(self, x: torch.Tensor, grid: torch.Tensor) -> torch.Tensor:
+        # Фон вне изображения — fill: сдвигаем так, чтобы fill стал нулём
+        out = F.grid_sample(x - self.fill, grid, mode="bilinear",
+                            padding_mode="zeros", align_corners=False)
+        return out + self.fill
+
+    def _grid(self, name: str, params: List[Dict[str, Any]], size: torch.Size) -> torch.Tensor:
+        h, w = int(size[0]), int(size[1])
+        if name == "scale":
+            return self._affine_grid([self._scale_theta(p["scale"]) for p in params], h, w)
+        if name == "shear":
+            return self._affine_grid([self._shear_theta(p, h, w) for p in params], h, w)
+        if name == "grid_distortion":
+            return self._distortion_grid(params, h, w)
+        return self._elastic_grid(params, h, w)
+
+    @staticmethod
+    def _scale_theta(scale: float) -> np.ndarray:
+        # Уменьшение относительно центра; scale >= 1 оставляет изображение как есть
+        inv = 1.0 / scale if scale < 1.0 else 1.0
+        return np.array([[inv, 0.0, 0.0], [0.0, inv, 0.0]])
+
+    @staticmethod
+    def _shear_theta(params: Dict[str, Any], h: int, w: int) -> np.ndarray:
+        # warpAffine отображает исходник в результат, grid_sample — наоборот,
+        # поэтому берём обратную матрицу в нормированных координатах [-1, 1]
+        shear = np.array([[1.0, params["kx"] * h / w], [params["ky"] * w / h, 1.0]])
+        scale = params.get("scale", 1.0)
+        theta = np.zeros((2, 3))
+        theta[:, :2] = np.linalg.inv(shear) / min(scale, 1.0)
+        return theta
+
+    @staticmethod
+    def _affine_grid(thetas: List[np.ndarray], h: int, w: int) -> torch.Tensor:
+        theta = torch.tensor(np.stack(thetas), dtype=torch.float32)
+        return F.affine_grid(theta, [len(thetas), 1, h, w], align_corners=False)
+
+    def _steps_map(self, num_steps: torch.Tensor, limits: torch.Tensor, length: int) -> torch.Tensor:
+        """
+        Кусочно-линейное отображение [0, 1] -> [0, 1] для каждого примера.
+
+        Ячейки сетки получают случайные длины 1 ± distort_limit и нормируются
+        так, чтобы сумма покрывала всю сторону (normalized=True в albumentations).
+        """
+        b = num_steps.shape[0]
+        max_steps = int(num_steps.max())
+
+        steps = 1.0 + (torch.rand(b, max_steps, generator=self.generator) * 2 - 1) * limits[:, None]
+        steps = steps * (torch.arange(max_steps)[None, :] < num_steps[:, None])
+        knots = torch.cat([torch.zeros(b, 1), steps.cumsum(dim=1)], dim=1)
+        knots = knots / knots.gather(1, num_steps[:, None])
+
+        u = (torch.arange(length, dtype=torch.float32) + 0.5) / length
+        pos = u[None, :] * num_steps[:, None]
+        cell = pos.floor().long().clamp(max=max_steps - 1)
+        cell = torch.minimum(cell, num_steps[:, None] - 1)
+        frac = pos - cell
+        left = knots.gather(1, cell)
+        right = knots.gather(1, cell + 1)
+        return left + (right - left) * frac
+
+    def _distortion_grid(self, params: List[Dict[str, Any]], h: int, w: int) -> torch.Tensor:
+        num_steps = torch.tensor([int(p["num_steps"]) for p in params])
+        limits = torch.tensor([float(p["distort_limit"]) for p in params])
+
+        xs = self._steps_map(num_steps, limits, w) * 2 - 1
+        ys = self._steps_map(num_steps, limits, h) * 2 - 1
+
+        b = len(params)
+        return torch.stack([xs[:, None, :].expand(b, h, w), ys[:, :, None].expand(b, h, w)], dim=-1)
+
+    def _elastic_grid(self, params: List[Dict[str, Any]], h: int, w: int) -> torch.Tensor:
+        """
+        Поле смещений elastic: равномерный шум, размытый гауссом с sigma примера.
+
+        Шум генерируется на сетке с шагом elastic_grid: сглаживающий гаусс
+        с sigma в десятки пикселей не пропускает мелкие детали, а амплитуда
+        шума делится на шаг, чтобы дисперсия размытого поля совпала
+        с полноразмерным вариантом.
+        """
+        b = len(params)
+        d = self.elastic_grid
+        gh, gw = max(1, math.ceil(h / d)), max(1, math.ceil(w / d))
+
+        sigmas = torch.tensor([float(p["sigma"]) for p in params]) / d
+        alphas = torch.tensor([float(p["alpha"]) for p in params])
+
+        noise = torch.rand(b * 2, 1, gh, gw, generator=self.generator) * 2 - 1
+        noise = noise / d
+
+        # Ядро как у cv2.GaussianBlur с ksize=(0, 0) для float: 8 sigma + 1
+        size = int(math.ceil(float(sigmas.max()) * 8 + 1)) | 1
+        size = min(size, 2 * max(gh, gw) - 1) | 1
+        kernels = _gaussian_kernels(sigmas.repeat_interleave(2), size)
+
+        field = noise.view(1, b * 2, gh, gw)
+        pad = size // 2
+        field = F.pad(field, (pad, pad, 0, 0), mode="replicate")
+        field = F.conv2d(field, kernels.view(b * 2, 1, 1, size), groups=b * 2)
+        field = F.pad(field, (0, 0, pad, pad), mode="replicate")
+        field = F.conv2d(field, kernels.view(b * 2, 1, size, 1), groups=b * 2)
+
+        field = field.view(b, 2, gh, gw)
+        if d > 1:
+            field = F.interpolate(field, size=(h, w), mode="bilinear", align_corners=False)
+
+        # Смещения в пикселях -> нормированные координаты grid_sample
+        field = field * alphas[:, None, None, None]
+        dx = field[:, 0] * (2.0 / w)
+        dy = field[:, 1] * (2.0 / h)
+
+        base = F.affine_grid(torch.eye(2, 3).expand(b, 2, 3), [b, 1, h, w], align_corners=False)
+        return base + torch.stack([dx, dy], dim=-1)
+
+    def _motion_blur(self, x: torch.Tensor, params: List[Dict[str, Any]]) -> torch.Tensor:
+        b, c, h, w = x.shape
+
+        kernels = []
+        for p in params:
+            shift = (0.0, 0.0)
+            if p.get("allow_shifted"):
+                shift = tuple((torch.rand(2, generator=self.generator) * 2 - 1).tolist())
+            kernels.append(motion_blur_kernel(p["blur_limit"], p["angle"], p["direction"], shift))
+
+        # Ядра разного размера дополняем нулями до общего (все нечётные — центр совпадает)
+        size = max(k.shape[0] for k in kernels)
+        weight = np.zeros((b, size, size), dtype=np.float32)
+        for i, k in enumerate(kernels):
+            off = (size - k.shape[0]) // 2
+            weight[i, off:off + k.shape[0], off:off + k.shape[1]] = k
+
+        weight = torch.from_numpy(weight).repeat_interleave(c, dim=0)[:, None]
+        pad = size // 2
+        # reflect в torch соответствует BORDER_REFLECT_101 у cv2.filter2D
+        mode = "reflect" if pad < min(h, w) else "replicate"
+        y = F.pad(x.reshape(1, b * c, h, w), (pad, pad, pad, pad), mode=mode)
+        y = F.conv2d(y, weight, groups=b * c)
+        return y.view(b, c, h, w)
+
+    @staticmethod
+    def _morphology_groups(
+        indices: List[int],
+        params: Sequence[Optional[Dict[str, Any]]],
+    ) -> List[Tuple[List[int], Tuple[int, int, int]]]:
+        groups: Dict[Tuple[int, int, int], List[int]] = {}
+        for i in indices:
+            p = params[i]
+            key = (int(p["kernel_h"]), int(p["kernel_w"]), int(p["iterations"]))
+            groups.setdefault(key, []).append(i)
+        return [(i_list, key) for key, i_list in groups.items()]
+
+    @staticmethod
+    def _morphology(x: torch.Tensor, kh: int, kw: int, iterations: int, erode: bool) -> torch.Tensor:
+        # Якорь ядра как у cv2 (k // 2): для чётных ядер паддинг несимметричный
+        pad = (kw // 2, kw - 1 - kw // 2, kh // 2, kh - 1 - kh // 2)
+        y = -x if erode else x
+        for _ in range(max(1, iterations)):
+            y = F.pad(y, pad, value=float("-inf"))
+            y = F.max_pool2d(y, (kh, kw), stride=1)
+        return -y if erode else y
+
+
+def _to_tensor(image: Any) -> torch.Tensor:
+    array = np.asarray(image)
+    if array.ndim == 2:
+        array = array[:, :, None]
+    return torch.from_numpy(np.ascontiguousarray(array.transpose(2, 0, 1)))
+
+
+def _to_image(x: torch.Tensor) -> np.ndarray:
+    array = x.permute(1, 2, 0).contiguous().numpy()
+    return array[:, :, 0] if array.shape[2] == 1 else array
+
+
+def augment_batch(
+    pipeline: Any,
+    images: torch.Tensor,
+    idxs: Optional[Sequence[int]] = None,
+    augmenter: Optional[TorchBatchAugmenter] = None,
+    force: bool = False,
+) -> Tuple[torch.Tensor, List[Dict[str, Any]]]:
+    """
+    Применить AugmentationPipeline к собранному батчу.
+
+    Выбор аугментации для каждого примера делает сам пайплайн (с тем же
+    seed + idx, что и при поштучном вызове), поддерживаемые аугментации
+    применяются батчем через TorchBatchAugmenter, остальные (augraphy) —
+    поштучно через numpy.
+
+    Args:
+        pipeline - AugmentationPipeline
+        images - тензор (B, C, H, W)
+        idxs - индексы примеров (обязательны, если у пайплайна задан seed)
+        augmenter - бэкенд (по умолчанию TorchBatchAugmenter())
+        force - аугментировать каждый пример, без учёта p_aug
+    Returns:
+        images - аугментированный батч
+        metas - метаданные по примерам, как у AugmentationPipeline
+    """
+    augmenter = augmenter or TorchBatchAugmenter()
+    if idxs is None:
+        idxs = [None] * images.shape[0]
+
+    names = [pipeline.choose(idx, force=force) for idx in idxs]
+    augs = [None if name is None else pipeline.get(name) for name in names]
+
+    batched = [aug if augmenter.supports(aug) else None for aug in augs]
+    out, params = augmenter(images, batched)
+
+    for i, aug in enumerate(augs):
+        if aug is not None and batched[i] is None:
+            image, params[i] = aug(_to_image(images[i]))
+            out[i] = _to_tensor(image).to(out.dtype)
+
+    metas: List[Dict[str, Any]] = []
+    for name, p in zip(names, params):
+        meta: Dict[str, Any] = {"applied": name is not None}
+        if name is not None:
+            meta["name"] = name
+            if pipeline.config.return_params:
+                meta["params"] = pipeline.get(name).scalar_params(p) if pipeline.config.compact_params else p
+        metas.append(meta)
+
+    return out, metas
@@ -3,12 +3,18 @@
 from typing import Any, Dict, Tuple
 import random
 
+import cv2
 import numpy as np
 from PIL import Image
-from augraphy.augmentations.watermark import WaterMark
 
+from ..utils.imports import lazy_import
 from .base import BaseAugmentation
 
+watermark = lazy_import("augraphy.augmentations.watermark")
+
+# Отступ от края страницы, как у augraphy (OverlayBuilder, edge_offset=10)
+_EDGE_OFFSET = 10
+
 
 class WaterMarkAugmentation(BaseAugmentation):
     """
@@ -22,6 +28,14 @@ class WaterMarkAugmentation(BaseAugmentation):
     """
 
     name = "watermark"
+    param_schema = {
+        "word": "str",
+        "font_size": "int32",
+        "font_thickness": "int32",
+        "rotation": "int32",
+    }
+    requires = ("augraphy.augmentations.watermark",)
+    tileable = True
 
     def __init__(
         self,
@@ -51,16 +65,8 @@ class WaterMarkAugmentation(BaseAugmentation):
             "rotation": (rotation, rotation),
         }
 
-    def apply(
-        self,
-        image: Image.Image | np.ndarray,
-        params: Dict[str, Any],
-    ) -> Image.Image | np.ndarray:
-        is_pil = isinstance(image, Image.Image)
-        if is_pil:
-            image = np.array(image)
-
-        transform = WaterMark(
+    def _transform(self, params: Dict[str, Any]) -> Any:
+        return watermark.WaterMark(
             watermark_word=params["word"],
             watermark_font_size=params["font_size"],
             watermark_font_thickness=params["font_thickness"],
@@ -71,6 +77,96 @@ class WaterMarkAugmentation(BaseAugmentation):
             p=1,
         )
 
-        image = transform(image)
+    @staticmethod
+    def _match_channels(patch: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Привести знак к числу каналов изображения: (H, W), (H, W, 1),
+        (H, W, 3) или (H, W, 4) — альфа-канал знака непрозрачный (255),
+        так что darken его не меняет.
+        """
+        if patch.ndim == 2:
+            patch = cv2.cvtColor(patch, cv2.COLOR_GRAY2BGR)
+        elif patch.shape[2] == 4:
+            patch = cv2.cvtColor(patch, cv2.COLOR_BGRA2BGR)
+
+        if len(shape) == 2:
+            return cv2.cvtColor(patch, cv2.COLOR_BGR2GRAY)
+
+        channels = shape[2]
+        if channels == 1:
+            return cv2.cvtColor(patch, cv2.COLOR_BGR2GRAY)[:, :, None]
+        if channels == 3:
+            return patch
+        if channels == 4:
+            alpha = np.full(patch.shape[:2] + (1,), 255, dtype=patch.dtype)
+            return np.concatenate([patch, alpha], axis=2)
+        raise ValueError(f"Unsupported number of channels: {channels}")
+
+    def prepare_tiles(self, shape: Tuple[int, ...], params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Отрисовать водяной знак один раз и выбрать его место на странице.
+
+        Для тайлов знак накладывается смешиванием darken (минимум) —
+        это локальная операция, её можно выполнять по фрагментам.
+        """
+        patch = self._transform(params).create_watermark()
+
+        h, w = shape[:2]
+        ph, pw = patch.shape[:2]
+        if ph > h or pw > w:
+            patch = cv2.resize(patch, (min(pw, w), min(ph, h)), interpolation=cv2.INTER_AREA)
+            ph, pw = patch.shape[:2]
+
+        patch = self._match_channels(patch, shape)
+
+        location = random.choice(["left", "right", "top", "bottom", "center"])
+        y, x = (h - ph) // 2, (w - pw) // 2
+        if location == "left":
+            x = _EDGE_OFFSET
+        elif location == "right":
+            x = w - pw - _EDGE_OFFSET
+        elif location == "top":
+            y = _EDGE_OFFSET
+        elif location == "bottom":
+            y = h - ph - _EDGE_OFFSET
+
+        return {
+            **params,
+            "patch": patch,
+            "origin": (max(0, min(y, h - ph)), max(0, min(x, w - pw))),
+        }
+
+    def apply_tile(
+        self,
+        tile: np.ndarray,
+        params: Dict[str, Any],
+        origin: Tuple[int, int],
+    ) -> np.ndarray:
+        patch = params["patch"]
+        py, px = params["origin"]
+        ty, tx = origin
+        th, tw = tile.shape[:2]
+
+        # Пересечение водяного знака с тайлом
+        y0, y1 = max(py, ty), min(py + patch.shape[0], ty + th)
+        x0, x1 = max(px, tx), min(px + patch.shape[1], tx + tw)
+        if y0 >= y1 or x0 >= x1:
+            return tile
+
+        out = tile.copy()
+        region = out[y0 - ty:y1 - ty, x0 - tx:x1 - tx]
+        np.minimum(region, patch[y0 - py:y1 - py, x0 - px:x1 - px], out=region)
+        return out
+
+    def apply(
+        self,
+        image: Image.Image | np.ndarray,
+        params: Dict[str, Any],
+    ) -> Image.Image | np.ndarray:
+        is_pil = isinstance(image, Image.Image)
+        if is_pil:
+            image = np.array(image)
+
+        image = self._transform(params)(image)
 
         return Image.fromarray(image) if is_pil else image
@@ -0,0 +1,5 @@
+from .autotune import (AugmentedSamples, TrialConfig, TrialResult,
+                       augmentation_costs, autotune, run_trial, sample_loader)
+
+__all__ = ['AugmentedSamples', 'TrialConfig', 'TrialResult',
+           'augmentation_costs', 'autotune', 'run_trial', 'sample_loader']
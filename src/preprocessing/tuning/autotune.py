@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import asdict, dataclass, replace
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+import torch
+from datasets import Dataset
+
+from ..augmentation_pipeline import AugmentationPipeline
+from ..configs import PipelineConfig
+from ..loaders import HFImageLoader
+
+
+@dataclass(frozen=True)
+class TrialConfig:
+    """
+    Точка пространства настроек загрузки.
+
+    Args:
+        num_workers - число воркеров DataLoader (0 — в основном процессе)
+        cv2_threads - cv2.setNumThreads в каждом воркере
+        batch_size - размер батча
+        prefetch_factor - батчей в очереди на воркер
+        aug_weights - веса аугментаций (None — веса из PipelineConfig)
+    """
+
+    num_workers: int = 0
+    cv2_threads: int = 1
+    batch_size: int = 32
+    prefetch_factor: int = 2
+    aug_weights: Optional[Tuple[Tuple[str, float], ...]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["aug_weights"] = dict(self.aug_weights) if self.aug_weights else None
+        return data
+
+
+@dataclass
+class TrialResult:
+    """
+    Результат одного прогона.
+
+    Args:
+        config - настройки
+        samples_per_sec - пропускная способность после прогрева
+        cpu_util - доля загрузки всех ядер (0..1) за время прогона
+        startup_sec - время до первого батча (запуск воркеров)
+        samples - число обработанных примеров
+    """
+
+    config: TrialConfig
+    samples_per_sec: float
+    cpu_util: float
+    startup_sec: float
+    samples: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.config.to_dict(),
+            "samples_per_sec": round(self.samples_per_sec, 2),
+            "cpu_util": round(self.cpu_util, 3),
+            "startup_sec": round(self.startup_sec, 3),
+            "samples": self.samples,
+        }
+
+
+class AugmentedSamples(torch.utils.data.Dataset):
+    """
+    Примеры HFImageLoader после AugmentationPipeline (как в обучении).
+    """
+
+    def __init__(self, loader: HFImageLoader, pipeline: Optional[AugmentationPipeline] = None):
+        self.loader = loader
+        self.pipeline = pipeline
+
+    def __len__(self) -> int:
+        return len(self.loader)
+
+    def __getitem__(self, idx: int) -> Tuple[np.ndarray, str]:
+        image, text, _ = self.loader.get_item(idx)
+        if self.pipeline is not None:
+            image, _ = self.pipeline(image, idx=idx)
+        return image, text
+
+
+def _list_collate(batch: List[Any]) -> List[Any]:
+    return batch
+
+
+def _worker_init(cv2_threads: int, worker_id: int) -> None:
+    cv2.setNumThreads(cv2_threads)
+    torch.set_num_threads(1)
+
+
+def _available_cpus() -> int:
+    # В контейнере os.cpu_count() видит все ядра хоста, а не доступные процессу
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _cpu_seconds() -> float:
+    # os.times учитывает и завершившиеся дочерние процессы (воркеры DataLoader)
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def sample_loader(loader: HFImageLoader, sample_size: int, seed: int = 0) -> HFImageLoader:
+    """
+    Подвыборка датасета для прогонов (для стриминга — первые sample_size примеров).
+    """
+    options = dict(
+        image_column=loader.image_column,
+        target_column=loader.target_column,
+        decode=loader.decode,
+        target_size=loader.target_size,
+        decode_backend=loader.decode_backend,
+    )
+
+    if loader.streaming:
+        rows = list(islice(loader.dataset, sample_size))
+        return HFImageLoader(Dataset.from_list(rows, features=loader.dataset.features), **options)
+
+    n = len(loader)
+    if n <= sample_size:
+        return loader
+    indices = np.sort(np.random.default_rng(seed).choice(n, size=sample_size, replace=False))
+    return HFImageLoader(loader.dataset.select(indices), **options)
+
+
+def run_trial(
+    samples: AugmentedSamples,
+    config: TrialConfig,
+    pipeline_config: Optional[PipelineConfig] = None,
+    seconds: float = 10.0,
+    seed: int = 0,
+) -> TrialResult:
+    """
+    Короткий прогон DataLoader с заданными настройками.
+
+    Пропускная способность считается после первого батча (запуск
+    воркеров учитывается отдельно в startup_sec), загрузка CPU —
+    по процессорному времени основного процесса и воркеров. Воркеры
+    живут между эпохами (persistent_workers), поэтому повторный проход
+    по маленькой подвыборке не добавляет их запуск в samples/s.
+    """
+    if len(samples) == 0:
+        raise ValueError("samples must not be empty")
+
+    if pipeline_config is not None:
+        if config.aug_weights is not None:
+            pipeline_config = replace(pipeline_config, aug_weights=dict(config.aug_weights))
+        samples = AugmentedSamples(samples.loader, AugmentationPipeline(pipeline_config, seed=seed))
+
+    previous_threads = cv2.getNumThreads()
+    cv2.setNumThreads(config.cv2_threads)
+
+    options: Dict[str, Any] = {}
+    if config.num_workers > 0:
+        options = {"prefetch_factor": config.prefetch_factor,
+                   "persistent_workers": True,
+                   "worker_init_fn": partial(_worker_init, config.cv2_threads)}
+
+    dataloader = torch.utils.data.DataLoader(
+        samples,
+        batch_size=config.batch_size,
+        shuffle=True,
+        num_workers=config.num_workers,
+        collate_fn=_list_collate,
+        generator=torch.Generator().manual_seed(seed),
+        **options,
+    )
+
+    cpu_start = _cpu_seconds()
+    start = time.perf_counter()
+    first = None
+    count = 0
+
+    iterator = iter(dataloader)
+    epoch_batches = 0
+    try:
+        while True:
+            try:
+                batch = next(iterator)
+            except StopIteration:
+                if epoch_batches == 0:
+                    raise ValueError("DataLoader produced no batches")
+                iterator = iter(dataloader)
+                epoch_batches = 0
+                continue
+
+            epoch_batches += 1
+
+            now = time.perf_counter()
+            if first is None:
+                first = now
+                continue
+
+            count += len(batch)
+            if now - first >= seconds:
+                break
+    finally:
+        # воркеры завершаются и попадают в children-время
+        del iterator, dataloader
+        cv2.setNumThreads(previous_threads)
+
+    end = time.perf_counter()
+    wall = end - start
+    cpu = _cpu_seconds() - cpu_start
+
+    return TrialResult(
+        config=config,
+        samples_per_sec=count / max(end - first, 1e-9),
+        cpu_util=cpu / (wall * _available_cpus()),
+        startup_sec=first - start,
+        samples=count,
+    )
+
+
+def augmentation_costs(
+    samples: AugmentedSamples,
+    pipeline_config: PipelineConfig,
+    num_samples: int = 32,
+) -> Dict[str, float]:
+    """
+    Среднее время (мс на изображение) каждой аугментации пайплайна.
+    """
+    n = min(num_samples, len(samples))
+    images = [samples.loader.get_item(i)[0] for i in range(n)]
+
+    costs: Dict[str, float] = {}
+    for name, aug in pipeline_config.augmentations.items():
+        start = time.perf_counter()
+        for image in images:
+            aug(image)
+        costs[name] = (time.perf_counter() - start) / max(n, 1) * 1000
+    return costs
+
+
+def autotune(
+    loader: HFImageLoader,
+    pipeline_config: Optional[PipelineConfig] = None,
+    budget_sec: float = 300.0,
+    trial_sec: float = 10.0,
+    sample_size: int = 2000,
+    num_workers: Sequence[int] = (0, 2, 4, 8),
+    cv2_threads: Sequence[int] = (1, 2),
+    batch_sizes: Sequence[int] = (8, 16, 32, 64),
+    prefetch_factors: Sequence[int] = (2, 4),
+    weight_candidates: Sequence[Dict[str, float]] = (),
+    seed: int = 0,
+    log: Optional[Callable[[TrialResult], None]] = None,
+) -> Tuple[TrialResult, List[TrialResult], Dict[str, float]]:
+    """
+    Подобрать настройки загрузки в пределах бюджета времени.
+
+    Покоординатный поиск: параметры перебираются по очереди (воркеры,
+    батч, потоки cv2, prefetch, веса аугментаций), остальные фиксируются
+    на лучших найденных значениях. Поиск останавливается, когда следующий
+    прогон не укладывается в budget_sec. Веса аугментаций меняют
+    распределение обучающих данных, поэтому перебираются только явно
+    заданные weight_candidates.
+
+    Args:
+        loader - HFImageLoader реального датасета
+        pipeline_config - конфигурация аугментаций (None — без аугментаций)
+        budget_sec - бюджет на весь поиск (секунды)
+        trial_sec - длительность одного прогона после прогрева
+        sample_size - размер подвыборки датасета
+        num_workers, cv2_threads, batch_sizes, prefetch_factors - кандидаты
+        weight_candidates - наборы весов аугментаций для сравнения
+        seed - seed подвыборки и пайплайна
+        log - callback после каждого прогона
+    Returns:
+        best - лучший прогон
+        results - все прогоны
+        costs - время аугментаций, мс на изображение
+    """
+    deadline = time.perf_counter() + budget_sec
+    samples = AugmentedSamples(sample_loader(loader, sample_size, seed=seed))
+
+    cpu_count = _available_cpus()
+    workers = sorted({w for w in num_workers if w <= cpu_count})
+    best_config = TrialConfig(
+        num_workers=workers[len(workers) // 2] if workers else 0,
+        cv2_threads=cv2_threads[0],
+        batch_size=batch_sizes[len(batch_sizes) // 2],
+        prefetch_factor=prefetch_factors[0],
+    )
+
+    weights = [None] + [tuple(sorted(w.items())) for w in weight_candidates]
+    axes = [
+        ("num_workers", workers),
+        ("batch_size", list(batch_sizes)),
+        ("cv2_threads", list(cv2_threads)),
+        ("prefetch_factor", list(prefetch_factors)),
+        ("aug_weights", weights if pipeline_config is not None else [None]),
+    ]
+
+    results: Dict[TrialConfig, TrialResult] = {}
+    last_trial = 0.0
+
+    def trial(config: TrialConfig) -> Optional[TrialResult]:
+        nonlocal last_trial
+        if config in results:
+            return results[config]
+        if time.perf_counter() + max(last_trial, trial_sec) > deadline and results:
+            return None
+
+        start = time.perf_counter()
+        result = run_trial(samples, config, pipeline_config, seconds=trial_sec, seed=seed)
+        last_trial = time.perf_counter() - start
+        results[config] = result
+        if log is not None:
+            log(result)
+        return result
+
+    best = trial(best_config)
+    for field, values in axes:
+        for value in values:
+            if field == "prefetch_factor" and best_config.num_workers == 0:
+                break
+            result = trial(replace(best_config, **{field: value}))
+            if result is None:
+                break
+            if result.samples_per_sec > best.samples_per_sec:
+                best = result
+        best_config = best.config
+
+    costs = augmentation_costs(samples, pipeline_config) if pipeline_config is not None else {}
+    return best, list(results.values()), costs
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Короткий (128 бит) хэш содержимого.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def image_hash(value: Any) -> str:
+    """
+    Хэш содержимого изображения.
+
+    Для закодированных изображений (dict {"bytes", "path"} из
+    datasets.Image(decode=False), bytes, путь) хэшируются байты файла
+    без декодирования. Для ndarray / PIL.Image — пиксели вместе с формой.
+
+    Args:
+        value - Изображение в одном из поддерживаемых форматов
+    Returns:
+        hash - hex-строка
+    """
+    if isinstance(value, dict):
+        if value.get("bytes") is not None:
+            value = value["bytes"]
+        else:
+            value = value["path"]
+
+    if isinstance(value, str):
+        with open(value, "rb") as f:
+            value = f.read()
+
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return content_hash(bytes(value))
+
+    arr = np.ascontiguousarray(np.asarray(value))
+    header = f"{arr.shape}|{arr.dtype}".encode()
+    return content_hash(header + arr.tobytes())
+
+
+def stable_id(value: Any) -> int:
+    """
+    Стабильный неотрицательный 63-битный id по содержимому (image_hash
+    для изображений, UTF-8 для строк). Подходит как seed + id для
+    AugmentationPipeline, когда позиционного idx нет (стриминг, shuffle).
+    """
+    if isinstance(value, str):
+        digest = content_hash(value.encode("utf-8"))
+    else:
+        digest = image_hash(value)
+    return int(digest[:16], 16) >> 1
+
+
+def config_hash(obj: Any) -> str:
+    """
+    Хэш JSON-сериализуемой конфигурации в каноническом виде
+    (сортированные ключи, без пробелов).
+    """
+    payload = json.dumps(
+        obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return content_hash(payload.encode("utf-8"))
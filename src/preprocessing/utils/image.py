@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+
+def to_numpy(image: Image.Image | np.ndarray) -> np.ndarray:
+    """
+    Привести изображение к numpy.ndarray без лишних копий.
+
+    Args:
+        image - Изображение в формате PIL.Image или numpy.ndarray
+    Returns:
+        image - numpy.ndarray (для ndarray возвращается тот же объект)
+    """
+    return np.asarray(image)
+
+
+def to_uint8(arr: np.ndarray) -> np.ndarray:
+    """
+    Привести массив к uint8. Float-изображения в диапазоне [0, 1]
+    растягиваются до [0, 255].
+    """
+    if arr.dtype == np.uint8:
+        return arr
+
+    arr = arr.astype(np.float32)
+    if arr.size and arr.max() <= 1.0:
+        arr *= 255.0
+    return np.clip(arr, 0, 255).astype(np.uint8)
+
+
+def to_gray(image: Image.Image | np.ndarray) -> np.ndarray:
+    """
+    Получить одноканальное uint8 изображение.
+
+    Args:
+        image - Изображение (L, RGB, RGBA или (H, W, 1))
+    Returns:
+        gray - numpy.ndarray формы (H, W)
+    """
+    if isinstance(image, Image.Image):
+        if image.mode != "L":
+            image = image.convert("L")
+        return np.asarray(image)
+
+    arr = to_uint8(np.asarray(image))
+    if arr.ndim == 2:
+        return arr
+    if arr.ndim == 3 and arr.shape[-1] == 1:
+        return arr[..., 0]
+    if arr.ndim == 3 and arr.shape[-1] == 3:
+        return cv2.cvtColor(arr, cv2.COLOR_RGB2GRAY)
+    if arr.ndim == 3 and arr.shape[-1] == 4:
+        return cv2.cvtColor(arr, cv2.COLOR_RGBA2GRAY)
+
+    raise ValueError(f"Unexpected image shape: {arr.shape}")
+
+
+def to_rgb(image: Image.Image | np.ndarray) -> np.ndarray:
+    """
+    Получить трёхканальное uint8 изображение.
+
+    Args:
+        image - Изображение (L, RGB, RGBA или (H, W, 1))
+    Returns:
+        rgb - numpy.ndarray формы (H, W, 3)
+    """
+    if isinstance(image, Image.Image):
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return np.asarray(image)
+
+    arr = to_uint8(np.asarray(image))
+    if arr.ndim == 2:
+        return cv2.cvtColor(arr, cv2.COLOR_GRAY2RGB)
+    if arr.ndim == 3 and arr.shape[-1] == 1:
+        return cv2.cvtColor(arr[..., 0], cv2.COLOR_GRAY2RGB)
+    if arr.ndim == 3 and arr.shape[-1] == 3:
+        return arr
+    if arr.ndim == 3 and arr.shape[-1] == 4:
+        return cv2.cvtColor(arr, cv2.COLOR_RGBA2RGB)
+
+    raise ValueError(f"Unexpected image shape: {arr.shape}")
+
+
+def downscale(
+    gray: np.ndarray,
+    max_side: Optional[int],
+) -> Tuple[np.ndarray, float]:
+    """
+    Уменьшить изображение так, чтобы большая сторона была не больше max_side.
+
+    Args:
+        gray - Исходное изображение
+        max_side - Ограничение на большую сторону (None — без уменьшения)
+    Returns:
+        small - Уменьшенное изображение (или исходное)
+        scale - Коэффициент small / gray (<= 1.0)
+    """
+    h, w = gray.shape[:2]
+    if max_side is None or max(h, w) <= max_side:
+        return gray, 1.0
+
+    scale = max_side / float(max(h, w))
+    new_w = max(1, int(round(w * scale)))
+    new_h = max(1, int(round(h * scale)))
+    small = cv2.resize(gray, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    return small, scale
+
+
+def binarize_ink(gray: np.ndarray) -> np.ndarray:
+    """
+    Otsu-бинаризация с инверсией: чернила -> 255, фон -> 0.
+    """
+    return otsu_ink(gray)[1]
+
+
+def otsu_ink(gray: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    Otsu-бинаризация с инверсией, возвращающая и найденный порог.
+
+    Returns:
+        threshold - Порог Otsu (пиксели <= threshold считаются чернилами)
+        mask - Бинарная маска: чернила -> 255, фон -> 0
+    """
+    threshold, mask = cv2.threshold(
+        gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU
+    )
+    return float(threshold), mask
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import importlib
+import types
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """
+    Прокси модуля, который импортируется при первом обращении к атрибуту.
+
+    Позволяет объявить тяжёлую зависимость (albumentations, augraphy)
+    на уровне модуля, не платя за её импорт, пока она не понадобится.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._load(), item)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Объявить модуль, который будет импортирован при первом использовании.
+
+    Args:
+        name - полное имя модуля (например, "augraphy.augmentations.watermark")
+    Returns:
+        LazyModule
+    """
+    return LazyModule(name)
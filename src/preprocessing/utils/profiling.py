@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence
+
+# Модули, загрузку которых стоит отслеживать при старте воркера
+HEAVY_MODULES = ("albumentations", "augraphy", "scipy", "skimage", "numba",
+                 "datasets", "pyarrow", "torch")
+
+DEFAULT_IMPORT_STATEMENTS = (
+    "import src.preprocessing.transforms",
+    "from src.preprocessing.transforms import ScaleAugmentation, ShearAugmentation; "
+    "ScaleAugmentation(); ShearAugmentation(shear_x_range=(-8.0, 8.0))",
+    "from src.preprocessing.transforms import MotionBlurAugmentation; MotionBlurAugmentation()",
+    "from src.preprocessing.transforms import BadPhotoCopyAugmentation; BadPhotoCopyAugmentation()",
+    "from src.preprocessing.augmentation_pipeline import AugmentationPipeline",
+)
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def _repo_root() -> str:
+    # .../src/preprocessing/utils/profiling.py -> корень репозитория,
+    # откуда пакет импортируется как src.preprocessing (как в main.py)
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def measure_import_time(
+    statement: str,
+    repeats: int = 3,
+    python: Optional[str] = None,
+) -> Dict[str, object]:
+    """
+    Измерить время выполнения statement в свежем интерпретаторе.
+
+    Каждый повтор запускается в отдельном процессе, поэтому измеряется
+    холодный импорт — так же, как при старте spawn-воркера.
+
+    Args:
+        statement - код для выполнения (обычно импорт и создание объектов)
+        repeats - число повторов
+        python - интерпретатор (по умолчанию текущий)
+    Returns:
+        dict - statement, min / median секунд и загруженные тяжёлые модули
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_repo_root(), env.get("PYTHONPATH")]))
+    code = _PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+
+    times: List[float] = []
+    heavy: List[str] = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [python or sys.executable, "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result["seconds"])
+        heavy = result["heavy"]
+
+    return {
+        "statement": statement,
+        "min_sec": min(times),
+        "median_sec": statistics.median(times),
+        "heavy_modules": heavy,
+    }
+
+
+def import_benchmark(
+    statements: Sequence[str] = DEFAULT_IMPORT_STATEMENTS,
+    repeats: int = 3,
+) -> List[Dict[str, object]]:
+    """
+    Бенчмарк времени импорта для набора сценариев.
+    """
+    return [measure_import_time(s, repeats=repeats) for s in statements]
@@ -0,0 +1,3 @@
+from .data_writer import DATASET_SCHEMA, ParquetShardWriter
+
+__all__ = ['DATASET_SCHEMA', 'ParquetShardWriter']
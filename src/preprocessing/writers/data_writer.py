@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Признаки в формате datasets, чтобы load_dataset("parquet", ...)
+# сразу распознавал колонку image как datasets.Image
+_HF_FEATURES = {
+    "image": {"_type": "Image"},
+    "text": {"dtype": "string", "_type": "Value"},
+    "dataset": {"dtype": "string", "_type": "Value"},
+    "split": {"dtype": "string", "_type": "Value"},
+    "source_split": {"dtype": "string", "_type": "Value"},
+}
+
+DATASET_SCHEMA = pa.schema(
+    [
+        ("image", pa.struct([("bytes", pa.binary()), ("path", pa.string())])),
+        ("text", pa.string()),
+        ("dataset", pa.string()),
+        ("split", pa.string()),
+        ("source_split", pa.string()),
+    ],
+    metadata={b"huggingface": json.dumps({"info": {"features": _HF_FEATURES}}).encode()},
+)
+
+
+def _row_bytes(value: Any) -> int:
+    """
+    Оценка объёма строки: длина бинарных и строковых значений.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, dict):
+        return sum(_row_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_row_bytes(v) for v in value)
+    return 8
+
+
+class ParquetShardWriter:
+    """
+    Потоковая запись строк в шардированные Parquet-файлы.
+
+    Строки копятся только до размера row group (row_group_rows строк
+    или row_group_bytes байт), после чего row group дописывается в
+    открытый шард через pq.ParquetWriter. Шард закрывается (временный
+    файл атомарно переименовывается) по rows_per_shard строк или по
+    max_shard_bytes байт, поэтому память ограничена одним row group,
+    а не целым шардом закодированных страниц.
+
+    Args:
+        out_dir - директория для шардов
+        prefix - префикс имён файлов (<prefix>-00000.parquet)
+        rows_per_shard - максимум строк в одном шарде
+        schema - pyarrow-схема (по умолчанию схема датасета
+            image/text/dataset/split/source_split)
+        max_shard_bytes - максимальный объём данных шарда (None — без ограничения)
+        row_group_rows - максимум строк в row group
+        row_group_bytes - максимальный объём row group в памяти
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        prefix: str = "part",
+        rows_per_shard: int = 1000,
+        schema: pa.Schema = DATASET_SCHEMA,
+        max_shard_bytes: Optional[int] = None,
+        row_group_rows: int = 128,
+        row_group_bytes: int = 64 * 1024 * 1024,
+    ):
+        if rows_per_shard < 1:
+            raise ValueError("rows_per_shard must be >= 1")
+        if max_shard_bytes is not None and max_shard_bytes < 1:
+            raise ValueError("max_shard_bytes must be >= 1")
+        if row_group_rows < 1 or row_group_bytes < 1:
+            raise ValueError("row_group_rows and row_group_bytes must be >= 1")
+
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.rows_per_shard = rows_per_shard
+        self.schema = schema
+        self.max_shard_bytes = max_shard_bytes
+        self.row_group_rows = row_group_rows
+        self.row_group_bytes = row_group_bytes
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_bytes = 0
+        self._paths: List[str] = []
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._tmp: Optional[str] = None
+        self._shard_rows = 0
+        self._shard_bytes = 0
+        self.rows_written = 0
+
+        os.makedirs(out_dir, exist_ok=True)
+
+    def _name(self) -> str:
+        return f"{self.prefix}-{len(self._paths):05d}.parquet"
+
+    def _write_row_group(self) -> None:
+        if not self._buffer:
+            return
+
+        if self._writer is None:
+            self._tmp = os.path.join(self.out_dir, f".{self._name()}.tmp")
+            self._writer = pq.ParquetWriter(self._tmp, self.schema)
+
+        self._writer.write_table(pa.Table.from_pylist(self._buffer, schema=self.schema))
+        self._shard_rows += len(self._buffer)
+        self._shard_bytes += self._buffer_bytes
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+        self._buffer_bytes = 0
+
+    def _close_shard(self) -> None:
+        self._write_row_group()
+        if self._writer is None:
+            return
+
+        self._writer.close()
+        path = os.path.join(self.out_dir, self._name())
+        os.replace(self._tmp, path)
+
+        self._paths.append(path)
+        self._writer = None
+        self._tmp = None
+        self._shard_rows = 0
+        self._shard_bytes = 0
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """
+        Добавить строку (dict с колонками схемы).
+        """
+        self._buffer.append(row)
+        self._buffer_bytes += _row_bytes(row)
+
+        shard_rows = self._shard_rows + len(self._buffer)
+        shard_bytes = self._shard_bytes + self._buffer_bytes
+        if shard_rows >= self.rows_per_shard or (
+            self.max_shard_bytes is not None and shard_bytes >= self.max_shard_bytes
+        ):
+            self._close_shard()
+        elif len(self._buffer) >= self.row_group_rows or self._buffer_bytes >= self.row_group_bytes:
+            self._write_row_group()
+
+    def write_batch(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def close(self) -> List[str]:
+        """
+        Дописать последний шард.
+
+        Returns:
+            paths - пути всех записанных шардов
+        """
+        self._close_shard()
+        return list(self._paths)
+
+    def abort(self) -> None:
+        """
+        Отбросить незаконченный шард (уже закрытые шарды остаются).
+        """
+        if self._writer is not None:
+            self._writer.close()
+            os.remove(self._tmp)
+        self._writer = None
+        self._tmp = None
+        self._buffer = []
+        self._buffer_bytes = 0
+
+    def __enter__(self) -> "ParquetShardWriter":
+        return self
+
+    def __exit__(self, exc_type: Optional[type], *args: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()